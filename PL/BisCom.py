@@ -7,6 +7,15 @@ from strings_with_arrows import *
 import string
 import os
 import math
+import re
+import bisect
+import itertools
+import sys
+import gc
+import hashlib
+import pickle
+import concurrent.futures
+import multiprocessing
 
 #------------------------------#
 # CONSTANTS
@@ -64,45 +73,107 @@ class RTError(Error):
     return result
 
   # Generate a traceback string with file information
+  # Lines are collected innermost first and reversed once, so deep recursion formats in linear time
   def generate_traceback(self):
-    result = ''
+    lines = []
     pos = self.pos_start
     ctx = self.context
 
     while ctx:
-      result = f'  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n' + result
+      lines.append(f'  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n')
       pos = ctx.parent_entry_pos
       ctx = ctx.parent
 
-    return 'Traceback (most recent call last):\n' + result
+    lines.reverse()
+    return 'Traceback (most recent call last):\n' + ''.join(lines)
 
 #------------------------------#
 # POSITION
 #------------------------------#
 
-# Definition of a Position class representing a point in the source code
-class Position:
-  def __init__(self, idx, ln, col, fn, ftxt):
-    self.idx = idx
-    self.ln = ln
-    self.col = col
+# Definition of a Source class holding the name and text of a file, its line index is built on first use
+class Source:
+  __slots__ = ('fn', 'text', 'line_starts', 'position_types')
+
+  def __init__(self, fn, text):
     self.fn = fn
-    self.ftxt = ftxt
+    self.text = text
+    self.line_starts = None
+
+    # Subclasses of Position and NextPosition bound to this source, so their instances need nothing but the offset
+    self.position_types = {
+      base: type(base.__name__, (base,), {'__slots__': (), 'source': self})
+      for base in (Position, NextPosition)
+    }
 
-  # Move the position to the next character, handling newline characters
-  def advance(self, current_char=None):
-    self.idx += 1
-    self.col += 1
+  # Line and column of a text offset, found by binary search over the offsets where lines start
+  def line_col(self, idx):
+    if self.line_starts is None:
+      self.line_starts = [0] + [newline.end() for newline in re.finditer('\n', self.text)]
 
-    if current_char == '\n':
-      self.ln += 1
-      self.col = 0
+    ln = bisect.bisect_right(self.line_starts, idx) - 1
+    return ln, idx - self.line_starts[ln]
 
-    return self
-  
-  # Create a copy of the current position
+  # Pickle by name and text, the Position types are made again when unpickling
+  def __reduce__(self):
+    return Source, (self.fn, self.text)
+
+# Definition of a Position class representing a point in the source code as an offset into its Source
+# A position is the offset itself, an int whose class carries the Source; test it against None, as offset 0 is falsy
+class Position(int):
+  __slots__ = ()
+
+  # Positions one character past another stay on the line of that character, even a newline
+  after = False
+
+  def __new__(cls, idx, source):
+    return int.__new__(source.position_types[cls], idx)
+
+  @property
+  def idx(self):
+    return int(self)
+
+  # Line and column are only worked out when an error is reported
+  def line_col(self):
+    return self.source.line_col(self)
+
+  @property
+  def ln(self):
+    return self.line_col()[0]
+
+  @property
+  def col(self):
+    return self.line_col()[1]
+
+  @property
+  def fn(self):
+    return self.source.fn
+
+  @property
+  def ftxt(self):
+    return self.source.text
+
+  # Position of the next character, on the same line as this one
+  def advance(self):
+    return NextPosition(self + 1, self.source)
+
+  # Positions never change, so a copy is the position itself
   def copy(self):
-    return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
+    return self
+
+  # Pickle through the base class, the Position types of a source only exist in this process
+  def __reduce__(self):
+    return (NextPosition if self.after else Position), (int(self), self.source)
+
+# Definition of a position one character past the previous one
+class NextPosition(Position):
+  __slots__ = ()
+
+  after = True
+
+  def line_col(self):
+    ln, col = self.source.line_col(self - 1)
+    return ln, col + 1
 
 #------------------------------#
 # TOKENS
@@ -123,6 +194,8 @@ TT_LPAREN   	= 'LPAREN'
 TT_RPAREN   	= 'RPAREN'
 TT_LSQUARE    = 'LSQUARE'
 TT_RSQUARE    = 'RSQUARE'
+TT_LBRACE     = 'LBRACE'
+TT_RBRACE     = 'RBRACE'
 TT_EE					= 'EE'
 TT_NE					= 'NE'
 TT_LT					= 'LT'
@@ -130,7 +203,9 @@ TT_GT					= 'GT'
 TT_LTE				= 'LTE'
 TT_GTE				= 'GTE'
 TT_COMMA			= 'COMMA'
+TT_COLON			= 'COLON'
 TT_ARROW			= 'ARROW'
+TT_TULDOK     = 'TULDOK'
 TT_SUNOD		  = 'SUNOD'
 TT_TUMOY			= 'TUMOY'
 
@@ -155,18 +230,19 @@ KEYWORDS = [
 ]
 
 class Token:
+  __slots__ = ('type', 'value', 'pos_start', 'pos_end')
+
   def __init__(self, type_, value=None, pos_start=None, pos_end=None):
     self.type = type_
     self.value = value
 
     # Set position start and end if provided
-    if pos_start:
-      self.pos_start = pos_start.copy()
-      self.pos_end = pos_start.copy()
-      self.pos_end.advance()
+    if pos_start is not None:
+      self.pos_start = pos_start
+      self.pos_end = pos_start.advance()
 
-    if pos_end:
-      self.pos_end = pos_end.copy()
+    if pos_end is not None:
+      self.pos_end = pos_end
 
   # Helper method to check if a token matches a given type and value
   def matches(self, type_, value):
@@ -181,230 +257,147 @@ class Token:
 # LEXER
 #------------------------------#
 
+# Whitespace and comments, a comment taking the newline that ends it along
+SKIP_PATTERN = r"(?:[ \t]+|\#[^\n]*\n?)*"
+SKIP_REGEX = re.compile(SKIP_PATTERN)
+
+# Master pattern of the lexer: skipped text, then one named group per kind of lexeme
+TOKEN_REGEX = re.compile(SKIP_PATTERN + rf"""(?:
+    (?P<NEWLINE>[;\n])
+  | (?P<NUMBER>[{NUMERO}]+(?:\.[{NUMERO}]*)?)
+  | (?P<IDENTIFIER>[{LETRA}][{LETRA_NUMERO}_]*)
+  | (?P<STRING>"(?P<STRING_BODY>(?:[^"\\]|\\.)*)(?P<STRING_END>")?)
+  | (?P<OPERATOR>->|==|!=|<=|>=|[-+*/^()\[\]{{}},:=<>.])
+  | (?P<BANG>!)
+  | (?P<END>\Z)
+)""", re.VERBOSE | re.DOTALL)
+
+# Operator lexemes and the token types they produce
+OPERATOR_TOKENS = {
+  '+': TT_DUGANG,
+  '-': TT_KWAI,
+  '*': TT_DAGHANON,
+  '/': TT_BAHIN,
+  '^': TT_KAPILAON,
+  '(': TT_LPAREN,
+  ')': TT_RPAREN,
+  '[': TT_LSQUARE,
+  ']': TT_RSQUARE,
+  '{': TT_LBRACE,
+  '}': TT_RBRACE,
+  ',': TT_COMMA,
+  ':': TT_COLON,
+  '.': TT_TULDOK,
+  '=': TT_EQ,
+  '<': TT_LT,
+  '>': TT_GT,
+  '->': TT_ARROW,
+  '==': TT_EE,
+  '!=': TT_NE,
+  '<=': TT_LTE,
+  '>=': TT_GTE,
+}
+
+# Escape sequences inside string literals, any other escaped character stands for itself
+ESCAPE_REGEX = re.compile(r'\\(.)', re.DOTALL)
+ESCAPE_CHARACTERS = {
+  'n': '\n',
+  't': '\t',
+  '"': '"'
+}
+
 class Lexer:
   # Initialize the Lexer with a filename and text input
   def __init__(self, fn, text):
     self.fn = fn
     self.text = text
-    self.pos = Position(-1, 0, -1, fn, text)
-    self.current_char = None
-    self.advance()
+    self.source = Source(fn, text)
 
-  # Move to the next character in the text
-  def advance(self):
-    self.pos.advance(self.current_char)
-    self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+  # Position of a text offset
+  def position(self, idx):
+    return Position(idx, self.source)
 
   # Generate a list of tokens from the input text
   def make_tokens(self):
-    tokens = []
-
-    while self.current_char != None:
-      if self.current_char in ' \t':
-        self.advance()
-      elif self.current_char == '#': # Skip comments starting with '#'
-        self.skip_comment()
-      elif self.current_char in ';\n': # Handle newline or semicolon as a token
-        tokens.append(Token(TT_SUNOD, pos_start=self.pos))
-        self.advance()
-      elif self.current_char in NUMERO:
-        tokens.append(self.make_number())
-      elif self.current_char in LETRA:
-        tokens.append(self.make_identifier())
-      elif self.current_char == '"':
-        tokens.append(self.make_string())
-      elif self.current_char == '+':
-        tokens.append(Token(TT_DUGANG, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == '-':
-        tokens.append(self.make_minus_or_arrow())
-      elif self.current_char == '*':
-        tokens.append(Token(TT_DAGHANON, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == '/':
-        tokens.append(Token(TT_BAHIN, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == '^':
-        tokens.append(Token(TT_KAPILAON, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == '(':
-        tokens.append(Token(TT_LPAREN, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == ')':
-        tokens.append(Token(TT_RPAREN, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == '[':
-        tokens.append(Token(TT_LSQUARE, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == ']':
-        tokens.append(Token(TT_RSQUARE, pos_start=self.pos))
-        self.advance()
-      elif self.current_char == '!':
-        token, error = self.make_not_equals()
-        if error: return [], error
-        tokens.append(token)
-      elif self.current_char == '=':
-        tokens.append(self.make_equals())
-      elif self.current_char == '<':
-        tokens.append(self.make_less_than())
-      elif self.current_char == '>':
-        tokens.append(self.make_greater_than())
-      elif self.current_char == ',':
-        tokens.append(Token(TT_COMMA, pos_start=self.pos))
-        self.advance()
-      else:
-        pos_start = self.pos.copy()
-        char = self.current_char
-        self.advance()
-        return [], IllegalCharError(pos_start, self.pos, "'" + char + "'")
-
-    tokens.append(Token(TT_TUMOY, pos_start=self.pos))
-    return tokens, None
-
-  # Parse numeric literals (integer or float)
-  def make_number(self):
-    num_str = ''
-    dot_count = 0
-    pos_start = self.pos.copy()
-
-    # Loop through characters while they are numeric or '.' to handle decimal point
-    while self.current_char != None and self.current_char in NUMERO + '.':
-      if self. current_char == '.':
-        if dot_count == 1: break
-        dot_count += 1
-      num_str += self.current_char
-      self.advance()
+    try:
+      return list(self.iter_tokens()), None
+    except ErrorSignal as signal:
+      return [], signal.error
 
-    # Determine token type based on dot_count
-    if dot_count == 0:
-      return Token(TT_KWARTA, int(num_str), pos_start, self.pos)
-    else:
-      return Token(TT_SINSILYO, float(num_str), pos_start, self.pos)
-  
-  # Parse string literals
-  def make_string(self):
-    string = ''
-    pos_start = self.pos.copy()
-    escape_character = False
-    self.advance()
+  # Yield the tokens of the input text one at a time, matching one whole lexeme at a time; a lexical error is raised as an ErrorSignal
+  def iter_tokens(self):
+    text = self.text
+    match = TOKEN_REGEX.match
 
-    escape_characters = {
-      'n': '\n',
-      't': '\t',
-      '"': '"'
-    }
+    # Positions are made straight from the Position type of this source, skipping Position.__new__
+    new_position = int.__new__
+    position_type = self.source.position_types[Position]
+    idx = 0
 
-    # Loop through characters while not reaching the end of the string to handle escape characters
-    while self.current_char != None and (self.current_char != '"' or escape_character):
-      if escape_character:
-        string += escape_characters.get(self.current_char, self.current_char)
-      else:
-        if self.current_char == '\\':
-          escape_character = True
-          self.advance()
-          continue # Skip the next character after encountering '\'
+    while True:
+      lexeme = match(text, idx)
+
+      # Nothing matches at an illegal character, found again after the text skipped before it
+      if lexeme is None:
+        idx = SKIP_REGEX.match(text, idx).end()
+        raise ErrorSignal(IllegalCharError(self.position(idx), self.position(idx + 1), "'" + text[idx] + "'"))
+
+      kind = lexeme.lastgroup
+      start = lexeme.start(kind)
+      end = lexeme.end()
+
+      # After an unterminated string the offset is past the text, where TUMOY still starts
+      if end < idx:
+        start = end = idx
+
+      pos_start = new_position(position_type, start)
+
+      if kind == 'IDENTIFIER':
+        id_str = lexeme.group(kind)
+        token = Token(TT_KEYWORD if id_str in KEYWORDS else TT_AYDI, id_str, pos_start, new_position(position_type, end))
+      elif kind == 'NEWLINE':
+        token = Token(TT_SUNOD, None, pos_start)
+      elif kind == 'OPERATOR':
+        token = Token(OPERATOR_TOKENS[lexeme.group(kind)], None, pos_start, new_position(position_type, end))
+      elif kind == 'NUMBER':
+        num_str = lexeme.group(kind)
+        if '.' in num_str:
+          token = Token(TT_SINSILYO, float(num_str), pos_start, new_position(position_type, end))
         else:
-          string += self.current_char
-      self.advance()
-      escape_character = False
-
-    # Move past the closing double quote
-    self.advance()
-    return Token(TT_TIBUOK, string, pos_start, self.pos)
-
-  # Parse identifiers (keywords or user-defined)
-  def make_identifier(self):
-    id_str = ''
-    pos_start = self.pos.copy()
-
-    while self.current_char != None and self.current_char in LETRA_NUMERO + '_':
-      id_str += self.current_char
-      self.advance()
-
-    tok_type = TT_KEYWORD if id_str in KEYWORDS else TT_AYDI
-    return Token(tok_type, id_str, pos_start, self.pos)
-
-  # Parse '-' or '->
-  def make_minus_or_arrow(self):
-    tok_type = TT_KWAI
-    pos_start = self.pos.copy()
-    self.advance()
-
-    # If followed by '>', update token type
-    if self.current_char == '>':
-      self.advance()
-      tok_type = TT_ARROW
-
-    return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-  # Parse '!='
-  def make_not_equals(self):
-    pos_start = self.pos.copy()
-    self.advance()
-
-    # If followed by '=', return not equals token
-    if self.current_char == '=':
-      self.advance()
-      return Token(TT_NE, pos_start=pos_start, pos_end=self.pos), None
-
-    self.advance()
-    return None, ExpectedCharError(pos_start, self.pos, "'=' (after '!')")
-
-  # Parse '=' or '=='
-  def make_equals(self):
-    tok_type = TT_EQ
-    pos_start = self.pos.copy()
-    self.advance()
-
-    # If followed by '=', update token type
-    if self.current_char == '=':
-      self.advance()
-      tok_type = TT_EE
-
-    return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-  # Parse '<' or '<='
-  def make_less_than(self):
-    tok_type = TT_LT
-    pos_start = self.pos.copy()
-    self.advance()
-
-    # If followed by '=', update token type
-    if self.current_char == '=':
-      self.advance()
-      tok_type = TT_LTE
-
-    return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-  # Parse '>' or '>='
-  def make_greater_than(self):
-    tok_type = TT_GT
-    pos_start = self.pos.copy()
-    self.advance()
-
-    # If followed by '=', update token type
-    if self.current_char == '=':
-      self.advance()
-      tok_type = TT_GTE
-
-    return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-  # Skip the initial character (assuming it is the '#' that indicates a comment)
-  def skip_comment(self):
-    self.advance()
-
-    # Loop through characters until a newline character is encountered
-    while self.current_char != '\n':
-      self.advance()
-
-    self.advance()
+          token = Token(TT_KWARTA, int(num_str), pos_start, new_position(position_type, end))
+      elif kind == 'STRING':
+        token, end = self.make_string(lexeme, pos_start, end)
+      elif kind == 'END':
+        yield Token(TT_TUMOY, None, pos_start)
+        return
+      else: # A '!' not followed by '=', the error also covers the character after it
+        raise ErrorSignal(ExpectedCharError(pos_start, self.position(start + 2), "'=' (after '!')"))
+
+      yield token
+      idx = end
+
+  # Parse string literals, returning the token and the offset after it
+  def make_string(self, lexeme, pos_start, end):
+    string = lexeme.group('STRING_BODY')
+    if '\\' in string:
+      string = ESCAPE_REGEX.sub(lambda escape: ESCAPE_CHARACTERS.get(escape.group(1), escape.group(1)), string)
+
+    # An unterminated string runs to the end of the text and ends one character past it
+    if lexeme.group('STRING_END') is None:
+      end = len(self.text) + 1
+
+    return Token(TT_TIBUOK, string, pos_start, Position(end, self.source)), end
 
 #------------------------------#
 # NODES
 #------------------------------#
 
+# Nodes declare their attributes in __slots__, so they carry no per-instance __dict__
+
 # Represents a node for holding a numeric value
 class NumberNode:
+  __slots__ = ('tok', 'pos_start', 'pos_end')
+
   def __init__(self, tok):
     self.tok = tok
 
@@ -417,6 +410,8 @@ class NumberNode:
 
 # Represents a node for holding a string value
 class StringNode:
+  __slots__ = ('tok', 'pos_start', 'pos_end')
+
   def __init__(self, tok):
     self.tok = tok
 
@@ -429,6 +424,31 @@ class StringNode:
 
 # Represents a node for holding a list of element nodes
 class ListNode:
+  __slots__ = ('element_nodes', 'pos_start', 'pos_end')
+
+  def __init__(self, element_nodes, pos_start, pos_end):
+    self.element_nodes = element_nodes
+
+    # Store the position information for error reporting
+    self.pos_start = pos_start
+    self.pos_end = pos_end
+
+# Represents a node for holding the key and value nodes of a map
+class MapNode:
+  __slots__ = ('key_nodes', 'value_nodes', 'pos_start', 'pos_end')
+
+  def __init__(self, key_nodes, value_nodes, pos_start, pos_end):
+    self.key_nodes = key_nodes
+    self.value_nodes = value_nodes
+
+    # Store the position information for error reporting
+    self.pos_start = pos_start
+    self.pos_end = pos_end
+
+# Represents a node for holding the element nodes of a set
+class SetNode:
+  __slots__ = ('element_nodes', 'pos_start', 'pos_end')
+
   def __init__(self, element_nodes, pos_start, pos_end):
     self.element_nodes = element_nodes
 
@@ -438,8 +458,11 @@ class ListNode:
 
 # Represents a node for accessing a variable
 class VarAccessNode:
+  __slots__ = ('var_name_tok', 'slot', 'pos_start', 'pos_end')
+
   def __init__(self, var_name_tok):
     self.var_name_tok = var_name_tok
+    self.slot = None # Frame slot assigned by the Resolver when the name is local to a function
 
     # Store the position information for error reporting
     self.pos_start = self.var_name_tok.pos_start
@@ -447,21 +470,53 @@ class VarAccessNode:
 
 # Represents a node for assigning a value to a variable
 class VarAssignNode:
+  __slots__ = ('var_name_tok', 'value_node', 'slot', 'pos_start', 'pos_end')
+
   def __init__(self, var_name_tok, value_node):
     self.var_name_tok = var_name_tok
     self.value_node = value_node
+    self.slot = None # Frame slot assigned by the Resolver when the name is local to a function
 
     # Store the position information for error reporting
     self.pos_start = self.var_name_tok.pos_start
     self.pos_end = self.value_node.pos_end
 
+# A binary operator: the Value method it applies and the function computing it on two raw numbers
+class BinaryOperator:
+  def __init__(self, method_name, number_fn):
+    self.method_name = method_name
+    self.number_fn = number_fn
+
+# Binary operators by operator key, the token type or the (TT_KEYWORD, value) pair of a keyword operator
+BINARY_OPERATORS = {
+  TT_DUGANG: BinaryOperator('added_to', lambda a, b: a + b),
+  TT_KWAI: BinaryOperator('subbed_by', lambda a, b: a - b),
+  TT_DAGHANON: BinaryOperator('multed_by', lambda a, b: a * b),
+  TT_BAHIN: BinaryOperator('dived_by', lambda a, b: a / b),
+  TT_KAPILAON: BinaryOperator('powed_by', lambda a, b: a ** b),
+  TT_EE: BinaryOperator('get_comparison_eq', lambda a, b: int(a == b)),
+  TT_NE: BinaryOperator('get_comparison_ne', lambda a, b: int(a != b)),
+  TT_LT: BinaryOperator('get_comparison_lt', lambda a, b: int(a < b)),
+  TT_GT: BinaryOperator('get_comparison_gt', lambda a, b: int(a > b)),
+  TT_LTE: BinaryOperator('get_comparison_lte', lambda a, b: int(a <= b)),
+  TT_GTE: BinaryOperator('get_comparison_gte', lambda a, b: int(a >= b)),
+  (TT_KEYWORD, 'UG'): BinaryOperator('anded_by', lambda a, b: int(a and b)),
+  (TT_KEYWORD, 'KUN'): BinaryOperator('ored_by', lambda a, b: int(a or b)),
+}
+
 # Represents a node for binary operations
 class BinOpNode:
+  __slots__ = ('left_node', 'op_tok', 'right_node', 'op_key', 'operator', 'pos_start', 'pos_end')
+
   def __init__(self, left_node, op_tok, right_node):
     self.left_node = left_node
     self.op_tok = op_tok
     self.right_node = right_node
 
+    # Resolve the operator once, so evaluating the node needs no chain of token tests
+    self.op_key = op_tok.type if op_tok.type != TT_KEYWORD else (op_tok.type, op_tok.value)
+    self.operator = BINARY_OPERATORS.get(self.op_key)
+
     # Store the position information for error reporting
     self.pos_start = self.left_node.pos_start
     self.pos_end = self.right_node.pos_end
@@ -469,8 +524,14 @@ class BinOpNode:
   def __repr__(self):
     return f'({self.left_node}, {self.op_tok}, {self.right_node})'
 
+  # Pickle by the constructor arguments, the operator is looked up again when unpickling
+  def __reduce__(self):
+    return BinOpNode, (self.left_node, self.op_tok, self.right_node)
+
 # Represents a node for unary operations
 class UnaryOpNode:
+  __slots__ = ('op_tok', 'node', 'pos_start', 'pos_end')
+
   def __init__(self, op_tok, node):
     self.op_tok = op_tok
     self.node = node
@@ -484,6 +545,8 @@ class UnaryOpNode:
 
 # Represents a node for an if statement
 class IfNode:
+  __slots__ = ('cases', 'else_case', 'pos_start', 'pos_end')
+
   def __init__(self, cases, else_case):
     self.cases = cases
     self.else_case = else_case
@@ -494,6 +557,8 @@ class IfNode:
 
 # Represents a node for a for loop
 class ForNode:
+  __slots__ = ('var_name_tok', 'start_value_node', 'end_value_node', 'step_value_node', 'body_node', 'should_return_null', 'slot', 'pos_start', 'pos_end')
+
   def __init__(self, var_name_tok, start_value_node, end_value_node, step_value_node, body_node, should_return_null):
     self.var_name_tok = var_name_tok
     self.start_value_node = start_value_node
@@ -501,6 +566,7 @@ class ForNode:
     self.step_value_node = step_value_node
     self.body_node = body_node
     self.should_return_null = should_return_null
+    self.slot = None # Frame slot of the loop variable, assigned by the Resolver
 
     # Store the position information for error reporting
     self.pos_start = self.var_name_tok.pos_start
@@ -508,6 +574,8 @@ class ForNode:
 
 # Represents a node for a while loop
 class WhileNode:
+  __slots__ = ('condition_node', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
   def __init__(self, condition_node, body_node, should_return_null):
     self.condition_node = condition_node
     self.body_node = body_node
@@ -519,11 +587,15 @@ class WhileNode:
 
 # Represents a node for function definition
 class FuncDefNode:
+  __slots__ = ('var_name_tok', 'arg_name_toks', 'body_node', 'should_auto_return', 'slot', 'scope', 'pos_start', 'pos_end')
+
   def __init__(self, var_name_tok, arg_name_toks, body_node, should_auto_return):
     self.var_name_tok = var_name_tok
     self.arg_name_toks = arg_name_toks
     self.body_node = body_node
     self.should_auto_return = should_auto_return
+    self.slot = None  # Frame slot of the function name, assigned by the Resolver
+    self.scope = None # Local names of the body, assigned by the Resolver
 
     # Determine the position information based on the components
     if self.var_name_tok:
@@ -537,9 +609,12 @@ class FuncDefNode:
 
 # Represents a node for a function call
 class CallNode:
+  __slots__ = ('node_to_call', 'arg_nodes', 'tail', 'pos_start', 'pos_end')
+
   def __init__(self, node_to_call, arg_nodes):
     self.node_to_call = node_to_call
     self.arg_nodes = arg_nodes
+    self.tail = False # Whether the Optimizer found the call to be the last thing its function does
 
     # Determine the position information based on the components
     self.pos_start = self.node_to_call.pos_start
@@ -549,8 +624,22 @@ class CallNode:
     else:
       self.pos_end = self.node_to_call.pos_end
 
+# Represents a node for accessing a member of a module
+class MemberAccessNode:
+  __slots__ = ('node', 'member_name_tok', 'pos_start', 'pos_end')
+
+  def __init__(self, node, member_name_tok):
+    self.node = node
+    self.member_name_tok = member_name_tok
+
+    # The access spans the value and the member name after the '.'
+    self.pos_start = self.node.pos_start
+    self.pos_end = self.member_name_tok.pos_end
+
 # Represents a node for a return statement
 class ReturnNode:
+  __slots__ = ('node_to_return', 'pos_start', 'pos_end')
+
   def __init__(self, node_to_return, pos_start, pos_end):
     self.node_to_return = node_to_return
 
@@ -560,6 +649,8 @@ class ReturnNode:
 
 # Represents a node for a continue statement
 class ContinueNode:
+  __slots__ = ('pos_start', 'pos_end')
+
   def __init__(self, pos_start, pos_end):
     # Store the position information for error reporting
     self.pos_start = pos_start
@@ -567,11 +658,41 @@ class ContinueNode:
 
 # Represents a node for a break statement
 class BreakNode:
+  __slots__ = ('pos_start', 'pos_end')
+
   def __init__(self, pos_start, pos_end):
     # Store the position information for error reporting
     self.pos_start = pos_start
     self.pos_end = pos_end
 
+# Yield the direct child nodes of a node, looking inside lists and if cases
+def iter_child_nodes(node):
+  for name in node.__slots__:
+    yield from iter_nodes_in(getattr(node, name))
+
+# Yield the nodes found in an attribute value, which may be a node, a token, None or a nested list or tuple
+def iter_nodes_in(value):
+  if isinstance(value, (list, tuple)):
+    for item in value:
+      yield from iter_nodes_in(item)
+  elif hasattr(value, 'pos_start') and not isinstance(value, Token):
+    yield value
+
+# Replace every direct child node of a node with the result of calling fn on it
+def transform_child_nodes(node, fn):
+  for name in node.__slots__:
+    setattr(node, name, transform_nodes_in(getattr(node, name), fn))
+
+# Rebuild an attribute value with fn applied to the nodes it contains
+def transform_nodes_in(value, fn):
+  if isinstance(value, list):
+    return [transform_nodes_in(item, fn) for item in value]
+  if isinstance(value, tuple):
+    return tuple(transform_nodes_in(item, fn) for item in value)
+  if hasattr(value, 'pos_start') and not isinstance(value, Token):
+    return fn(value)
+  return value
+
 #------------------------------#
 # PARSE RESULT
 #------------------------------#
@@ -620,10 +741,45 @@ class ParseResult:
 # PARSER
 #------------------------------#
 
+# Tokens a streaming parser reads from the lexer at a time
+PARSER_READ_AHEAD = 32
+
+# Binding power of the binary operators by operator key, from 'UG' binding loosest to '^' binding tightest
+LOGIC_PRECEDENCE = 1
+COMPARISON_PRECEDENCE = 2
+POWER_PRECEDENCE = 5
+BINARY_PRECEDENCE = {
+  (TT_KEYWORD, 'UG'): LOGIC_PRECEDENCE,
+  (TT_KEYWORD, 'OR'): LOGIC_PRECEDENCE,
+  TT_EE: COMPARISON_PRECEDENCE,
+  TT_NE: COMPARISON_PRECEDENCE,
+  TT_LT: COMPARISON_PRECEDENCE,
+  TT_GT: COMPARISON_PRECEDENCE,
+  TT_LTE: COMPARISON_PRECEDENCE,
+  TT_GTE: COMPARISON_PRECEDENCE,
+  TT_DUGANG: 3,
+  TT_KWAI: 3,
+  TT_DAGHANON: 4,
+  TT_BAHIN: 4,
+  TT_KAPILAON: POWER_PRECEDENCE,
+}
+
+# Token types and keywords that can start an expression, and the keywords that only start a statement
+EXPR_START_TYPES = {TT_KWARTA, TT_SINSILYO, TT_TIBUOK, TT_AYDI, TT_DUGANG, TT_KWAI, TT_LPAREN, TT_LSQUARE, TT_LBRACE}
+EXPR_START_KEYWORDS = {'PASA', 'DILI', 'KUNG', 'PARA', 'SAMTANG', 'ROTA'}
+STATEMENT_START_KEYWORDS = {'BALIK', 'UNAHAN', 'HUNONG'}
+
 class Parser:
-  # Initialize the Parser with a list of tokens
+  # Initialize the Parser with a list of tokens, or any other iterable of them to parse them while they are lexed
   def __init__(self, tokens):
-    self.tokens = tokens
+    if isinstance(tokens, list):
+      self.tokens = tokens
+      self.token_stream = None
+    else:
+      self.tokens = []
+      self.token_stream = iter(tokens)
+    self.tokens_start = 0     # Index of self.tokens[0] among all tokens, the ones before it were dropped
+    self.backtrack_marks = [] # Indices the parser may reverse to, the tokens from the first one on are kept
     self.tok_idx = -1
     self.advance()
 
@@ -641,8 +797,28 @@ class Parser:
 
   # Update the current token based on the current index
   def update_current_tok(self):
-    if self.tok_idx >= 0 and self.tok_idx < len(self.tokens):
-      self.current_tok = self.tokens[self.tok_idx]
+    idx = self.tok_idx - self.tokens_start
+    if idx >= len(self.tokens) and self.token_stream:
+      self.read_tokens(idx)
+      idx = self.tok_idx - self.tokens_start
+
+    if idx >= 0 and idx < len(self.tokens):
+      self.current_tok = self.tokens[idx]
+
+  # Pull tokens from the stream past a buffer index, dropping the tokens no reverse can reach once they are half the buffer
+  def read_tokens(self, idx):
+    keep = min(self.backtrack_marks[0], self.tok_idx) if self.backtrack_marks else self.tok_idx
+    drop = keep - self.tokens_start
+    if drop > 0 and drop * 2 >= len(self.tokens):
+      del self.tokens[:drop]
+      self.tokens_start = keep
+      idx -= drop
+
+    count = idx + PARSER_READ_AHEAD - len(self.tokens)
+    read_count = len(self.tokens)
+    self.tokens.extend(itertools.islice(self.token_stream, count))
+    if len(self.tokens) - read_count < count:
+      self.token_stream = None
 
   # Parse the entire program and return the result
   def parse(self):
@@ -672,26 +848,21 @@ class Parser:
     if res.error: return res
     statements.append(statement)
 
-    more_statements = True
-
-    # Parse additional statements separated by newlines
-    while True:
-      newline_count = 0
+    # Parse additional statements separated by newlines, until the token after the newlines cannot start one
+    while self.current_tok.type == TT_SUNOD:
       while self.current_tok.type == TT_SUNOD:
         res.register_advancement()
         self.advance()
-        newline_count += 1
-      if newline_count == 0:
-        more_statements = False
 
-      if not more_statements: break
-      
-      # Try to parse another statement, stop if unsuccessful
+      if not self.at_statement_start(): break
+
+      # A statement that fails to parse ends the statements before it, leaving its first token to the caller
+      self.backtrack_marks.append(self.tok_idx)
       statement = res.try_register(self.statement())
+      self.backtrack_marks.pop()
       if not statement:
         self.reverse(res.to_reverse_count)
-        more_statements = False
-        continue
+        break
       statements.append(statement)
 
     # Return a ListNode containing all parsed statements
@@ -701,6 +872,15 @@ class Parser:
       self.current_tok.pos_end.copy()
     ))
 
+  # Check whether the current token can start an expression
+  def at_expr_start(self):
+    tok = self.current_tok
+    return tok.type in EXPR_START_TYPES or (tok.type == TT_KEYWORD and tok.value in EXPR_START_KEYWORDS)
+
+  # Check whether the current token can start a statement
+  def at_statement_start(self):
+    return self.at_expr_start() or self.current_tok.type == TT_KEYWORD and self.current_tok.value in STATEMENT_START_KEYWORDS
+
   # Parse a single statement
   def statement(self):
     res = ParseResult()
@@ -712,9 +892,14 @@ class Parser:
       res.register_advancement()
       self.advance()
 
-      expr = res.try_register(self.expr())
-      if not expr:
-        self.reverse(res.to_reverse_count)
+      # The value is optional, it is only parsed when the next token can start an expression, and is left to
+      # the caller from its first token when it fails to parse
+      expr = None
+      if self.at_expr_start():
+        self.backtrack_marks.append(self.tok_idx)
+        expr = res.try_register(self.expr())
+        self.backtrack_marks.pop()
+        if not expr: self.reverse(res.to_reverse_count)
       return res.success(ReturnNode(expr, pos_start, self.current_tok.pos_start.copy()))
 
     # Continue statement
@@ -734,7 +919,7 @@ class Parser:
     if res.error:
       return res.failure(InvalidSyntaxError(
         self.current_tok.pos_start, self.current_tok.pos_end,
-        "Expected 'BALIK', 'UNAHAN', 'HUNONG', 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[' or 'DILI'"
+        "Expected 'BALIK', 'UNAHAN', 'HUNONG', 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[', '{' or 'DILI'"
       ))
     return res.success(expr)
 
@@ -770,76 +955,83 @@ class Parser:
       return res.success(VarAssignNode(var_name, expr))
 
     # Parse binary operations
-    node = res.register(self.bin_op(self.comp_expr, ((TT_KEYWORD, 'UG'), (TT_KEYWORD, 'OR'))))
+    node = res.register(self.binary_expr(LOGIC_PRECEDENCE))
 
     if res.error:
       return res.failure(InvalidSyntaxError(
         self.current_tok.pos_start, self.current_tok.pos_end,
-        "Expected 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[' or 'DILI'"
+        "Expected 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[', '{' or 'DILI'"
       ))
 
     return res.success(node)
 
-  # Parse a comparison expression
-  def comp_expr(self):
+  # Parse operators binding at least as tightly as a precedence, by precedence climbing
+  def binary_expr(self, min_precedence):
     res = ParseResult()
+    tok = self.current_tok
 
-    # Unary 'not' operation
-    if self.current_tok.matches(TT_KEYWORD, 'DILI'):
-      op_tok = self.current_tok
+    # Prefix operators, 'DILI' applies to a whole comparison and '+' or '-' to a power
+    if tok.type in (TT_DUGANG, TT_KWAI):
       res.register_advancement()
       self.advance()
-
-      node = res.register(self.comp_expr())
+      operand = res.register(self.binary_expr(POWER_PRECEDENCE))
       if res.error: return res
-      return res.success(UnaryOpNode(op_tok, node))
-
-    # Parse binary operations with comparison operators
-    node = res.register(self.bin_op(self.arith_expr, (TT_EE, TT_NE, TT_LT, TT_GT, TT_LTE, TT_GTE)))
-
-    if res.error:
-      return res.failure(InvalidSyntaxError(
-        self.current_tok.pos_start, self.current_tok.pos_end,
-        "Expected int, float, identifier, '+', '-', '(', '[', 'KUNG', 'PARA', 'SAMTANG', 'ROTA' or 'DILI'"
-      ))
-
-    return res.success(node)
-
-  # Parse arithmetic expressions using the bin_op function with addition and subtraction operators
-  def arith_expr(self):
-    return self.bin_op(self.term, (TT_DUGANG, TT_KWAI))
-
-  # Parse term expressions using the bin_op function with multiplication and division operators
-  def term(self):
-    return self.bin_op(self.factor, (TT_DAGHANON, TT_BAHIN))
+      left = UnaryOpNode(tok, operand)
+    elif min_precedence <= COMPARISON_PRECEDENCE and tok.matches(TT_KEYWORD, 'DILI'):
+      res.register_advancement()
+      self.advance()
+      operand = res.register(self.binary_expr(COMPARISON_PRECEDENCE))
+      if res.error: return res
+      left = UnaryOpNode(tok, operand)
+    else:
+      left = res.register(self.call())
+      if res.error:
+        if min_precedence > COMPARISON_PRECEDENCE: return res
+        return res.failure(InvalidSyntaxError(
+          self.current_tok.pos_start, self.current_tok.pos_end,
+          "Expected int, float, identifier, '+', '-', '(', '[', '{', 'KUNG', 'PARA', 'SAMTANG', 'ROTA' or 'DILI'"
+        ))
 
-  # Parse factor expressions
-  def factor(self):
-    res = ParseResult()
-    tok = self.current_tok
+    # Fold the operators that follow into the left operand, each right operand taking only the operators binding tighter
+    while True:
+      op_tok = self.current_tok
+      precedence = BINARY_PRECEDENCE.get(op_tok.type if op_tok.type != TT_KEYWORD else (op_tok.type, op_tok.value))
+      if precedence is None or precedence < min_precedence: break
 
-    # Handle unary operations (positive and negative)
-    if tok.type in (TT_DUGANG, TT_KWAI):
       res.register_advancement()
       self.advance()
-      factor = res.register(self.factor())
-      if res.error: return res
-      return res.success(UnaryOpNode(tok, factor))
 
-    return self.power()
+      # '^' is right associative, its right operand takes the '^' after it as well
+      right = res.register(self.binary_expr(precedence if precedence == POWER_PRECEDENCE else precedence + 1))
+      if res.error: return res
+      left = BinOpNode(left, op_tok, right)
 
-  # Parse power expressions
-  def power(self):
-    return self.bin_op(self.call, (TT_KAPILAON, ), self.factor)
+    return res.success(left)
 
-  # Parse function calls
+  # Parse function calls and member accesses, which apply left to right to the atom and to each other
   def call(self):
     res = ParseResult()
     atom = res.register(self.atom())
     if res.error: return res
 
-    # Handle function calls with arguments
-    if self.current_tok.type == TT_LPAREN:
+    while self.current_tok.type in (TT_LPAREN, TT_TULDOK):
+      # Handle member accesses, the '.' is followed by the name of the member
+      if self.current_tok.type == TT_TULDOK:
+        res.register_advancement()
+        self.advance()
+
+        if self.current_tok.type != TT_AYDI:
+          return res.failure(InvalidSyntaxError(
+            self.current_tok.pos_start, self.current_tok.pos_end,
+            "Expected identifier"
+          ))
+
+        atom = MemberAccessNode(atom, self.current_tok)
+        res.register_advancement()
+        self.advance()
+        continue
+
+      # Handle function calls with arguments
       res.register_advancement()
       self.advance()
       arg_nodes = []
@@ -853,7 +1045,7 @@ class Parser:
         if res.error:
           return res.failure(InvalidSyntaxError(
             self.current_tok.pos_start, self.current_tok.pos_end,
-            "Expected ')', 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[' or 'DILI'"
+            "Expected ')', 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[', '{' or 'DILI'"
           ))
 
         # Handle multiple arguments in the function call
@@ -873,7 +1065,7 @@ class Parser:
 
         res.register_advancement()
         self.advance()
-      return res.success(CallNode(atom, arg_nodes))
+      atom = CallNode(atom, arg_nodes)
     return res.success(atom)
 
   # Parse atomic expressions
@@ -921,6 +1113,12 @@ class Parser:
       if res.error: return res
       return res.success(list_expr)
 
+    # Parse map and set expressions
+    elif tok.type == TT_LBRACE:
+      map_expr = res.register(self.map_expr())
+      if res.error: return res
+      return res.success(map_expr)
+
     # Parse if expressions
     elif tok.matches(TT_KEYWORD, 'KUNG'):
       if_expr = res.register(self.if_expr())
@@ -948,7 +1146,7 @@ class Parser:
     # If none of the above patterns match, raise an error
     return res.failure(InvalidSyntaxError(
       tok.pos_start, tok.pos_end,
-      "Expected int, float, identifier, '+', '-', '(', '[', KUNG', 'PARA', 'SAMTANG', 'ROTA'"
+      "Expected int, float, identifier, '+', '-', '(', '[', '{', KUNG', 'PARA', 'SAMTANG', 'ROTA'"
     ))
 
   # Parse list expressions
@@ -976,7 +1174,7 @@ class Parser:
       if res.error:
         return res.failure(InvalidSyntaxError(
           self.current_tok.pos_start, self.current_tok.pos_end,
-          "Expected ']', 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[' or 'DILI'"
+          "Expected ']', 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[', '{' or 'DILI'"
         ))
 
       # Handle multiple elements in the list
@@ -1004,6 +1202,75 @@ class Parser:
       self.current_tok.pos_end.copy()
     ))
 
+  # Parse map and set expressions, a map when the first element is followed by ':'
+  def map_expr(self):
+    res = ParseResult()
+    key_nodes = []
+    value_nodes = []
+    pos_start = self.current_tok.pos_start.copy()
+
+    # Ensure the map starts with '{'
+    if self.current_tok.type != TT_LBRACE:
+      return res.failure(InvalidSyntaxError(
+        self.current_tok.pos_start, self.current_tok.pos_end,
+        f"Expected '{{'"
+      ))
+
+    res.register_advancement()
+    self.advance()
+
+    # Empty map
+    if self.current_tok.type == TT_RBRACE:
+      pos_end = self.current_tok.pos_end.copy()
+      res.register_advancement()
+      self.advance()
+      return res.success(MapNode(key_nodes, value_nodes, pos_start, pos_end))
+
+    key_nodes.append(res.register(self.expr()))
+    if res.error:
+      return res.failure(InvalidSyntaxError(
+        self.current_tok.pos_start, self.current_tok.pos_end,
+        "Expected '}', 'PASA', 'KUNG', 'PARA', 'SAMTANG', 'ROTA', int, float, identifier, '+', '-', '(', '[', '{' or 'DILI'"
+      ))
+    is_map = self.current_tok.type == TT_COLON
+
+    # Handle the value of every key of a map, and the elements of a set after the first
+    while True:
+      if is_map:
+        if self.current_tok.type != TT_COLON:
+          return res.failure(InvalidSyntaxError(
+            self.current_tok.pos_start, self.current_tok.pos_end,
+            f"Expected ':'"
+          ))
+
+        res.register_advancement()
+        self.advance()
+
+        value_nodes.append(res.register(self.expr()))
+        if res.error: return res
+
+      if self.current_tok.type != TT_COMMA: break
+      res.register_advancement()
+      self.advance()
+
+      key_nodes.append(res.register(self.expr()))
+      if res.error: return res
+
+    # Ensure the map ends with '}'
+    if self.current_tok.type != TT_RBRACE:
+      return res.failure(InvalidSyntaxError(
+        self.current_tok.pos_start, self.current_tok.pos_end,
+        f"Expected ',' or '}}'"
+      ))
+
+    pos_end = self.current_tok.pos_end.copy()
+    res.register_advancement()
+    self.advance()
+
+    # Return the parsed map or set expression
+    if is_map: return res.success(MapNode(key_nodes, value_nodes, pos_start, pos_end))
+    return res.success(SetNode(key_nodes, pos_start, pos_end))
+
   # Parse if expression
   def if_expr(self):
     res = ParseResult()
@@ -1404,26 +1671,115 @@ class Parser:
 
   ###################################
 
-  # If func_b is not provided, set it to func_a
-  def bin_op(self, func_a, ops, func_b=None):
-    if func_b == None:
-      func_b = func_a
 
-    # Parse left operand using func_a
-    res = ParseResult()
-    left = res.register(func_a())
-    if res.error: return res
+# Lex and parse a program together, the parser pulling each token from the lexer when it needs it
+def parse_source(fn, text):
+  tokens = Lexer(fn, text).iter_tokens()
+  try:
+    ast = Parser(tokens).parse()
+
+    # A lexical error further on is still reported instead of the syntax error, as if the text had been lexed first
+    if ast.error:
+      for _ in tokens: pass
+      return None, ast.error
+  except ErrorSignal as signal:
+    return None, signal.error
+
+  return ast.node, None
+
+# Parsed programs, pickled so that every run gets a fresh tree to resolve and optimize, by (fn, text)
+parse_cache = {}
+PARSE_CACHE_SIZE = 64
+
+# Directory next to a source file holding its parsed program, like __pycache__ does for Python
+PARSE_CACHE_DIR = '__bobcache__'
+
+# Cache entries are only valid for the BisCom.py and Python that wrote them
+with open(__file__, 'rb') as f:
+  PARSE_CACHE_VERSION = hashlib.sha256(f.read() + sys.version.encode()).hexdigest().encode()
+
+# Path of the on-disk cache entry of a source file, None when fn is not a file, like '<stdin>'
+def parse_cache_path(fn):
+  if not os.path.isfile(fn): return None
+  directory, name = os.path.split(os.path.abspath(fn))
+  return os.path.join(directory, PARSE_CACHE_DIR, name + '.bobc')
+
+# Read the pickled tree of a source from its on-disk cache entry, None when it is missing, stale or unreadable
+def read_parse_cache(path, source_hash):
+  try:
+    with open(path, 'rb') as f:
+      if f.readline().rstrip(b'\n') != PARSE_CACHE_VERSION: return None
+      if f.readline().rstrip(b'\n') != source_hash: return None
+      return f.read()
+  except OSError:
+    return None
+
+# Write the on-disk cache entry of a source, through a temporary file so a reader never sees half an entry
+def write_parse_cache(path, source_hash, data):
+  if sys.dont_write_bytecode: return
+  try:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+      f.write(PARSE_CACHE_VERSION + b'\n' + source_hash + b'\n' + data)
+    os.replace(temp_path, path)
+  except OSError:
+    pass
+
+# Call fn with the cyclic garbage collector paused, building or pickling a large tree makes many objects but no garbage cycles
+def without_gc(fn, *args):
+  if not gc.isenabled(): return fn(*args)
+  gc.disable()
+  try:
+    return fn(*args)
+  finally:
+    gc.enable()
+
+# Hash identifying a source in its on-disk cache entry
+def source_hash(fn, text):
+  return hashlib.sha256(fn.encode() + b'\0' + text.encode()).hexdigest().encode()
+
+# Pickle a parsed tree, None when it is too deep to pickle and is simply not cached
+def dump_tree(node):
+  try:
+    return without_gc(pickle.dumps, node, pickle.HIGHEST_PROTOCOL)
+  except RecursionError:
+    return None
+
+# Keep the pickled tree of a source in memory, dropping the oldest entry when the cache is full
+def store_parse_cache(key, data):
+  if len(parse_cache) >= PARSE_CACHE_SIZE and key not in parse_cache:
+    del parse_cache[next(iter(parse_cache))]
+  parse_cache[key] = data
+
+# Parse a program, reusing the tree kept in memory or on disk when the same source was parsed before
+def cached_parse(fn, text):
+  key = (fn, text)
+  data = parse_cache.get(key)
+  path = None
+
+  if data is None:
+    text_hash = source_hash(fn, text)
+    path = parse_cache_path(fn)
+    if path: data = read_parse_cache(path, text_hash)
+
+  # A corrupt entry is parsed again and overwritten
+  if data is not None:
+    try:
+      node = without_gc(pickle.loads, data)
+    except Exception:
+      data = None
 
-    # Continue parsing while the current token is an operator
-    while self.current_tok.type in ops or (self.current_tok.type, self.current_tok.value) in ops:
-      op_tok = self.current_tok # Get the operator token
-      res.register_advancement()
-      self.advance()
-      right = res.register(func_b()) # Parse right operand using func_b
-      if res.error: return res
-      left = BinOpNode(left, op_tok, right) # Create a binary operation node with left, operator, and right operands
+  if data is None:
+    node, error = without_gc(parse_source, fn, text)
+    if error: return None, error
 
-    return res.success(left)
+    data = dump_tree(node)
+    if data is None: return node, None
+    if path: write_parse_cache(path, text_hash, data)
+
+  store_parse_cache(key, data)
+  return node, None
 
 #------------------------------#
 # RUNTIME RESULT
@@ -1489,6 +1845,81 @@ class RTResult:
       self.loop_should_break
     )
 
+# Dictionary of the methods of a class by key, resolving the method of a key once, the first time it is looked up
+class DispatchTable(dict):
+  def __init__(self, cls, method_name, fallback):
+    super().__init__()
+    self.cls = cls
+    self.method_name = method_name # Function from a key to the name of its method
+    self.fallback = fallback
+
+  # Resolve and remember the method of a key seen for the first time
+  def __missing__(self, key):
+    method = getattr(self.cls, self.method_name(key), self.fallback)
+    self[key] = method
+    return method
+
+# Signals raised by the interpreter and compiled closures; they unwind Python frames until the matching loop, function or run() catches them
+class ErrorSignal(Exception):
+  def __init__(self, error):
+    self.error = error
+
+class ReturnSignal(Exception):
+  def __init__(self, value):
+    self.value = value
+
+class BreakSignal(Exception):
+  pass
+
+class ContinueSignal(Exception):
+  pass
+
+# Raised by a tail call to the call running its function, which then makes the tail call in its place
+class TailCallSignal(Exception):
+  def __init__(self, function, args, context, pos_start, pos_end):
+    self.function = function
+    self.args = args
+    self.context = context
+    self.pos_start = pos_start
+    self.pos_end = pos_end
+
+  # Make the tail call as an ordinary call from its call site, for a signal that reached no call running a function
+  def call(self):
+    if isinstance(self.function, Function):
+      return self.function.call(self.args, self.context, self.pos_start, self.pos_end)
+    return unwrap_result(self.function.copy().set_pos(self.pos_start, self.pos_end).set_context(self.context).execute(self.args))
+
+# Raise the failure of a runtime result as the matching signal, otherwise return its value
+def unwrap_result(res):
+  if res.should_return():
+    if res.error: raise ErrorSignal(res.error)
+    if res.loop_should_continue: raise ContinueSignal()
+    if res.loop_should_break: raise BreakSignal()
+    raise ReturnSignal(res.func_return_value)
+  return res.value
+
+# Call fn with the given arguments and turn the signal it ends with into a runtime result
+def catch_signals(fn, *args):
+  try:
+    return RTResult().success(fn(*args))
+  except ErrorSignal as signal:
+    return RTResult().failure(signal.error)
+  except ReturnSignal as signal:
+    return RTResult().success_return(signal.value)
+  except BreakSignal:
+    return RTResult().success_break()
+  except ContinueSignal:
+    return RTResult().success_continue()
+
+# Run a whole program with fn, making a tail call that escapes it as an ordinary call whose value the program returns
+def run_program(fn, *args):
+  try:
+    return fn(*args)
+  except TailCallSignal as signal:
+    res = catch_signals(signal.call)
+    if res.should_return(): return res
+    return RTResult().success_return(box_value(res.value))
+
 #------------------------------#
 # VALUES
 #------------------------------#
@@ -1570,6 +2001,10 @@ class Value:
   def execute(self, args):
     return RTResult().failure(self.illegal_operation())
 
+  # Default method for accessing a member of a value
+  def get_member(self, name):
+    return None, self.illegal_operation()
+
   # Raise an exception if the copy method is not defined
   def copy(self):
     raise Exception('No copy method defined')
@@ -1720,16 +2155,104 @@ Number.false = Number(0)
 Number.true = Number(1)
 Number.math_PI = Number(math.pi)
 
+# The interpreter keeps numbers as raw Python scalars and boxes them into Numbers only where a Value is needed
+# complex is included because raising a negative number to a fractional power produces one
+RAW_NUMBER_TYPES = (int, float, complex)
+
+# Wrap a raw number in a Number, leaving any other value as it is
+def box_value(value):
+  if type(value) in RAW_NUMBER_TYPES: return Number(value)
+  return value
+
+# Unwrap a Number into its raw number, leaving any other value as it is
+def unbox_value(value):
+  if type(value) is Number: return value.value
+  return value
+
+# Check the truthiness of a raw number or a Value
+def value_is_true(value):
+  if type(value) in RAW_NUMBER_TYPES: return value != 0
+  return value.is_true()
+
+# Apply a binary Value method, placing the operands at their source spans so errors point at them
+def slow_binary_op(method_name, left, right, left_span, right_span, context):
+  left.set_pos(*left_span).set_context(context)
+  right.set_pos(*right_span).set_context(context)
+  result, error = getattr(left, method_name)(right)
+  if error: raise ErrorSignal(error)
+  return result
+
+# Apply a binary Value method to operands that may be shared with symbol tables and lists, leaving them untouched
+# A failing operation has no side effects, so it is repeated on copies placed at the operand spans to report its error
+def shared_binary_op(method_name, left, right, left_span, right_span, context):
+  result, error = getattr(left, method_name)(right)
+  if error: slow_binary_op(method_name, left.copy(), right.copy(), left_span, right_span, context)
+  return result
+
+# Get a member of a value, repeating a failed lookup on a copy placed at the access span so its error points there
+def member_of(value, member_name, span, context):
+  value = box_value(value)
+  member, error = value.get_member(member_name)
+  if error:
+    _, error = value.copy().set_pos(*span).set_context(context).get_member(member_name)
+    raise ErrorSignal(error)
+  return member
+
+# Concatenations shorter than this are joined right away, longer ones grow a Rope
+ROPE_MIN_LENGTH = 256
+
+# Pieces of a String grown by concatenation, shared by the String and its copies. The buffer of pieces may
+# be shared with the ropes of Strings grown from it, each of which sees only its first count pieces. The rope
+# whose count is the length of the buffer owns its end and may append to it in place
+class Rope:
+  __slots__ = ('pieces', 'count')
+
+  # Initialize the Rope object with a buffer of pieces and how many of them the rope sees
+  def __init__(self, pieces, count):
+    self.pieces = pieces
+    self.count = count
+
+  # Whether the rope owns the end of its buffer
+  def owns_end(self):
+    return self.count == len(self.pieces)
+
+  # Join the pieces the rope sees into one, which becomes its only piece
+  def flatten(self):
+    if self.count != 1:
+      self.pieces = [''.join(self.pieces[:self.count])]
+      self.count = 1
+    return self.pieces[0]
+
+# String class representing string values
 class String(Value):
-  # Initialize the String object with a string value
-  def __init__(self, value):
+  # Initialize the String object with a string value, or with the rope it is the concatenation of
+  def __init__(self, value, rope=None):
     super().__init__()
-    self.value = value
-
-  # Concatenate the current String with another String
+    self.flat = value
+    self.rope = rope
+
+  # The characters of the String, flattening its rope on first use
+  @property
+  def value(self):
+    if self.flat is None:
+      self.flat = self.rope.flatten()
+    return self.flat
+
+  # Concatenate the current String with another String, appending to the rope of the current String in
+  # place when it owns its end
   def added_to(self, other):
     if isinstance(other, String):
-      return String(self.value + other.value).set_context(self.context), None
+      # Flatten the other String first, as it may share the rope of the current String
+      piece = other.value
+      rope = self.rope
+      if rope is not None and rope.owns_end():
+        rope.pieces.append(piece)
+        new_rope = Rope(rope.pieces, rope.count + 1)
+      elif rope is None and len(self.flat) + len(piece) < ROPE_MIN_LENGTH:
+        return String(self.flat + piece).set_context(self.context), None
+      else:
+        new_rope = Rope([self.value, piece], 2)
+      return String(None, new_rope).set_context(self.context), None
     else:
       return None, Value.illegal_operation(self, other)
 
@@ -1772,9 +2295,9 @@ class String(Value):
   def is_true(self):
     return len(self.value) > 0
 
-  # Create a copy of the current String
+  # Create a copy of the current String, which shares its rope and so is flattened along with it
   def copy(self):
-    copy = String(self.value)
+    copy = String(self.flat, self.rope)
     copy.set_pos(self.pos_start, self.pos_end)
     copy.set_context(self.context)
     return copy
@@ -1787,41 +2310,144 @@ class String(Value):
   def __repr__(self):
     return f'"{self.value}"'
 
+# Storage of a List and its copies. Its buffer may be shared with the stores of Lists made from it by
+# +, - and *, each of which sees only the first length elements of it. The store whose length is the length
+# of the buffer owns its end and may append to it in place, and it is shared when another store sees a prefix
+class ListStore:
+  __slots__ = ('buffer', 'start', 'end', 'shared', 'owner')
+
+  # Initialize the ListStore object with a buffer, the part of it the store sees, whether it is shared and
+  # whether it may own the end of the buffer, as only one of the stores seeing the end may append to it
+  def __init__(self, buffer, start, end, shared=False, owner=True):
+    self.buffer = buffer
+    self.start = start
+    self.end = end
+    self.shared = shared
+    self.owner = owner
+
+  # The number of elements the store sees
+  @property
+  def length(self):
+    return self.end - self.start
+
+  # Whether the store owns the end of its buffer
+  def owns_end(self):
+    return self.owner and self.end == len(self.buffer)
+
+  # Give the store a buffer of its own holding what it sees
+  def own_buffer(self):
+    self.buffer = self.buffer[self.start:self.end]
+    self.start = 0
+    self.end = len(self.buffer)
+    self.shared = False
+    self.owner = True
+
+  # Give the store a buffer of its own, unless it owns the end of the one it has
+  def own_end(self):
+    if not self.owns_end(): self.own_buffer()
+
+  # Give the store a buffer of its own, unless no other store sees the one it has
+  def own_all(self):
+    if self.shared or not self.owns_end(): self.own_buffer()
+
 # List class representing list values
 class List(Value):
-  # Initialize the List object with a list of elements
-  def __init__(self, elements):
+  # Initialize the List object with a list of elements, or with the store of the List it is a copy of
+  def __init__(self, elements, store=None):
     super().__init__()
-    self.elements = elements
+    self.store = ListStore(elements, 0, len(elements)) if store is None else store
+
+  # The elements of the List, which must not be changed in place
+  @property
+  def elements(self):
+    store = self.store
+    if store.start == 0 and store.end == len(store.buffer): return store.buffer
+    return store.buffer[store.start:store.end]
+
+  # The number of elements in the List
+  @property
+  def length(self):
+    return self.store.length
+
+  # Retrieve the element at an index, which may count from the end
+  def get(self, index):
+    store = self.store
+    return store.buffer[store.start + range(store.length)[index]]
+
+  # Append an element to the List in place
+  def append(self, value):
+    store = self.store
+    store.own_end()
+    store.buffer.append(value)
+    store.end += 1
+
+  # Append the elements of another List to the List in place
+  def extend(self, other):
+    elements = other.elements
+    store = self.store
+    store.own_end()
+    store.buffer.extend(elements)
+    store.end = len(store.buffer)
+
+  # Remove the element at an index from the List in place and return it
+  def pop(self, index):
+    index = range(self.store.length)[index]
+    store = self.store
+    store.own_all()
+    store.end -= 1
+    return store.buffer.pop(index)
+
+  # Make a new List with the elements of the current List and some more, appending them to the buffer
+  # in place when the current List owns its end and there is something to append, as only one store may own it
+  def extended_copy(self, elements):
+    store = self.store
+    if store.owns_end() and elements:
+      store.buffer.extend(elements)
+      new_store = ListStore(store.buffer, store.start, len(store.buffer), True)
+    else:
+      buffer = store.buffer[store.start:store.end]
+      buffer.extend(elements)
+      new_store = ListStore(buffer, 0, len(buffer))
+    return List(None, new_store).set_pos(self.pos_start, self.pos_end).set_context(self.context)
 
   # Add an element to the current List
   def added_to(self, other):
-    new_list = self.copy()
-    new_list.elements.append(other)
-    return new_list, None
+    return self.extended_copy((other,)), None
 
   # Remove an element from the current List at a specified index
   def subbed_by(self, other):
     if isinstance(other, Number):
-      new_list = self.copy()
+      store = self.store
       try:
-        new_list.elements.pop(other.value)
-        return new_list, None
+        index = range(store.length)[other.value]
       except:
         return None, RTError(
           other.pos_start, other.pos_end,
           'Element at this index could not be removed from list because index is out of bounds',
           self.context
         )
+      # Dropping the last or the first element only narrows the view of the buffer, and the end of the buffer
+      # goes with the view still seeing it
+      if index == store.length - 1:
+        if store.owns_end(): store.shared = True
+        new_store = ListStore(store.buffer, store.start, store.end - 1)
+      elif index == 0:
+        new_store = ListStore(store.buffer, store.start + 1, store.end, True, store.owns_end())
+        store.shared = True
+        store.owner = False
+        # Once most of the buffer is dropped elements the view moves to a buffer of its own, so they are freed
+        if new_store.start > new_store.length: new_store.own_buffer()
+      else:
+        index += store.start
+        new_store = ListStore(store.buffer[store.start:index] + store.buffer[index + 1:store.end], 0, store.length - 1)
+      return List(None, new_store).set_pos(self.pos_start, self.pos_end).set_context(self.context), None
     else:
       return None, Value.illegal_operation(self, other)
 
   # Concatenate the current List with another List
   def multed_by(self, other):
     if isinstance(other, List):
-      new_list = self.copy()
-      new_list.elements.extend(other.elements)
-      return new_list, None
+      return self.extended_copy(other.elements), None
     else:
       return None, Value.illegal_operation(self, other)
 
@@ -1829,7 +2455,7 @@ class List(Value):
   def dived_by(self, other):
     if isinstance(other, Number):
       try:
-        return self.elements[other.value], None
+        return self.get(other.value), None
       except:
         return None, RTError(
           other.pos_start, other.pos_end,
@@ -1839,9 +2465,9 @@ class List(Value):
     else:
       return None, Value.illegal_operation(self, other)
 
-  # Create a copy of the current List
+  # Create a copy of the current List, which shares its store and so sees changes made in place
   def copy(self):
-    copy = List(self.elements)
+    copy = List(None, self.store)
     copy.set_pos(self.pos_start, self.pos_end)
     copy.set_context(self.context)
     return copy
@@ -1854,27 +2480,337 @@ class List(Value):
   def __repr__(self):
     return f'[{", ".join([repr(x) for x in self.elements])}]'
 
+# Entry of a change in a HashStore standing for a key the version does not have
+MISSING = object()
+
+# Numbers ordering the entries of every HashStore by when their keys were first added
+entry_order = itertools.count()
+
+# Times the dict of a HashStore may be moved back to the same older version before that version gets a copy
+HASH_REROOT_LIMIT = 2
+
+# Storage of a Map or Set and its copies, a dict from hashed keys to entries made of an order number and an
+# item. The store of the newest version holds the dict, and the store of every older version holds the change
+# that turns the dict of the next version into its own, so a version is made in O(1) and the dict is moved
+# back to an older version by undoing the changes in between
+class HashStore:
+  __slots__ = ('table', 'key', 'entry', 'next', 'reroots')
+
+  # Initialize the HashStore object with the dict of the newest version
+  def __init__(self, table):
+    self.table = table
+    self.key = None
+    self.entry = None
+    self.next = None
+    self.reroots = 0
+
+  # The dict of the version, taken from the store holding it by undoing the changes on the way
+  # A version the dict keeps being moved back to, as when an older and a newer version are read in turn,
+  # gets a dict of its own instead, after which reading either costs nothing
+  def get_table(self):
+    if self.next is None: return self.table
+
+    path = []
+    store = self
+    while store.next is not None:
+      path.append(store)
+      store = store.next
+    table = store.table
+
+    self.reroots += 1
+    if self.reroots > HASH_REROOT_LIMIT:
+      table = dict(table)
+      for store in reversed(path):
+        if store.entry is MISSING:
+          del table[store.key]
+        else:
+          table[store.key] = store.entry
+      self.table, self.key, self.entry, self.next = table, None, None, None
+      return table
+
+    # Each store passed leaves the one after it the change that leads back
+    for store in reversed(path):
+      next_store = store.next
+      old_entry = table.get(store.key, MISSING)
+      if store.entry is MISSING:
+        del table[store.key]
+      else:
+        table[store.key] = store.entry
+      next_store.table, next_store.key, next_store.entry, next_store.next = None, store.key, old_entry, store
+      store.table, store.key, store.entry, store.next = table, None, None, None
+    return table
+
+  # Make the store of a new version with the item of a key changed, or removed when it is MISSING
+  # A changed key keeps its place in the order, a new one goes last
+  def changed(self, key, item):
+    table = self.get_table()
+    old_entry = table.get(key, MISSING)
+    if item is MISSING:
+      del table[key]
+    else:
+      table[key] = (next(entry_order) if old_entry is MISSING else old_entry[0], item)
+    new_store = HashStore(table)
+    self.table, self.key, self.entry, self.next = None, key, old_entry, new_store
+    return new_store
+
+# The key a Number or String is stored under in a Map or Set, None for values that cannot be keys
+def hash_key(value):
+  if isinstance(value, (Number, String)): return value.value
+  return None
+
+# Make the dict of a HashStore from hashed keys and items, returning it and None, or None and the index of
+# a key that cannot be hashed
+def make_table(keys, items):
+  table = {}
+  for index, (key, item) in enumerate(zip(keys, items)):
+    hashed = hash_key(key)
+    if hashed is None: return None, index
+    old_entry = table.get(hashed)
+    table[hashed] = (next(entry_order) if old_entry is None else old_entry[0], item)
+  return table, None
+
+# Make a Map of keys and values, returning it and None, or None and the index of a key that cannot be hashed
+def make_map(keys, values):
+  table, index = make_table(keys, zip(keys, values))
+  if table is None: return None, index
+  return Map(table), None
+
+# Make a Set of elements, returning it and None, or None and the index of an element that cannot be hashed
+def make_set(elements):
+  table, index = make_table(elements, elements)
+  if table is None: return None, index
+  return Set(table), None
+
+# Error of a key of a Map or an element of a Set that is neither a number nor a string
+def unhashable_error(pos_start, pos_end, context):
+  return RTError(pos_start, pos_end, 'Key must be a number or string', context)
+
+# Base class of the Map and Set values, persistent versions of a dict kept in a HashStore
+class HashedValue(Value):
+  # Initialize the value with a dict, or with the store of the value it is a copy of
+  def __init__(self, table, store=None):
+    super().__init__()
+    self.store = HashStore(table) if store is None else store
+
+  # The dict of the value, which must not be changed in place
+  @property
+  def table(self):
+    return self.store.get_table()
+
+  # The hashed keys and items of the value, in the order their keys were first added
+  def hashed_items(self):
+    return [(key, entry[1]) for key, entry in sorted(self.table.items(), key=lambda pair: pair[1][0])]
+
+  # The items of the value, in the order their keys were first added
+  def items(self):
+    return [item for _, item in sorted(self.table.values(), key=lambda entry: entry[0])]
+
+  # Make a value of the same type holding another version
+  def with_store(self, store):
+    return type(self)(None, store).set_pos(self.pos_start, self.pos_end).set_context(self.context)
+
+  # Make the version with the item of a hashed key changed, or removed when it is MISSING
+  def changed(self, key, item):
+    return self.with_store(self.store.changed(key, item))
+
+  # Make the version with the items of another value of the same type added
+  def merged(self, other):
+    store = self.store
+    for key, item in other.hashed_items():
+      store = store.changed(key, item)
+    return self.with_store(store)
+
+  # Check if the value is logically true (non-empty)
+  def is_true(self):
+    return len(self.table) > 0
+
+  # Create a copy of the current value, which shares its store
+  def copy(self):
+    copy = type(self)(None, self.store)
+    copy.set_pos(self.pos_start, self.pos_end)
+    copy.set_context(self.context)
+    return copy
+
+# Map class representing hash maps from numbers and strings to values, whose items are key and value pairs
+class Map(HashedValue):
+  # The keys of the Map, in the order they were first added
+  def keys(self):
+    return [key for key, _ in self.items()]
+
+  # The values of the Map, in the order of their keys
+  def values(self):
+    return [value for _, value in self.items()]
+
+  # Insert a key and a value given as a List of the two
+  def added_to(self, other):
+    if isinstance(other, List) and other.length == 2:
+      key, value = other.elements
+      hashed = hash_key(key)
+      if hashed is None:
+        return None, unhashable_error(other.pos_start, other.pos_end, self.context)
+      return self.changed(hashed, (key, value)), None
+    else:
+      return None, Value.illegal_operation(self, other)
+
+  # Remove a key from the current Map
+  def subbed_by(self, other):
+    hashed = hash_key(other)
+    if hashed is None:
+      return None, unhashable_error(other.pos_start, other.pos_end, self.context)
+    if hashed not in self.table:
+      return None, RTError(
+        other.pos_start, other.pos_end,
+        'Key could not be removed from map because it is not in it',
+        self.context
+      )
+    return self.changed(hashed, MISSING), None
+
+  # Merge another Map into the current Map, its values replacing those of the keys both have
+  def multed_by(self, other):
+    if isinstance(other, Map):
+      return self.merged(other), None
+    else:
+      return None, Value.illegal_operation(self, other)
+
+  # Retrieve the value of a key from the current Map
+  def dived_by(self, other):
+    hashed = hash_key(other)
+    if hashed is None:
+      return None, unhashable_error(other.pos_start, other.pos_end, self.context)
+    entry = self.table.get(hashed, MISSING)
+    if entry is MISSING:
+      return None, RTError(
+        other.pos_start, other.pos_end,
+        'Value of this key could not be retrieved from map because it is not in it',
+        self.context
+      )
+    return entry[1][1], None
+
+  # Convert the Map to a string for display
+  def __str__(self):
+    return ", ".join([f'{key}: {value}' for key, value in self.items()])
+
+  # Representation of the Map object
+  def __repr__(self):
+    return '{' + ", ".join([f'{key!r}: {value!r}' for key, value in self.items()]) + '}'
+
+# Set class representing hash sets of numbers and strings, whose items are their elements
+class Set(HashedValue):
+  # Add an element to the current Set
+  def added_to(self, other):
+    hashed = hash_key(other)
+    if hashed is None:
+      return None, unhashable_error(other.pos_start, other.pos_end, self.context)
+    if hashed in self.table: return self.copy(), None
+    return self.changed(hashed, other), None
+
+  # Remove an element from the current Set
+  def subbed_by(self, other):
+    hashed = hash_key(other)
+    if hashed is None:
+      return None, unhashable_error(other.pos_start, other.pos_end, self.context)
+    if hashed not in self.table:
+      return None, RTError(
+        other.pos_start, other.pos_end,
+        'Element could not be removed from set because it is not in it',
+        self.context
+      )
+    return self.changed(hashed, MISSING), None
+
+  # Make the union of the current Set and another Set
+  def multed_by(self, other):
+    if isinstance(other, Set):
+      return self.merged(other), None
+    else:
+      return None, Value.illegal_operation(self, other)
+
+  # Check if an element is in the current Set
+  def dived_by(self, other):
+    hashed = hash_key(other)
+    if hashed is None:
+      return None, unhashable_error(other.pos_start, other.pos_end, self.context)
+    return Number(int(hashed in self.table)).set_context(self.context), None
+
+  # Convert the Set to a string for display
+  def __str__(self):
+    return ", ".join([str(x) for x in self.items()])
+
+  # Representation of the Set object
+  def __repr__(self):
+    return '{' + ", ".join([repr(x) for x in self.items()]) + '}'
+
+# Module class representing a program loaded by LARGA, whose top level names are its members
+class Module(Value):
+  # Initialize the Module object with a name and the symbol table its program ran in
+  def __init__(self, name, symbol_table):
+    super().__init__()
+    self.name = name
+    self.symbol_table = symbol_table
+
+  # Get a name defined at the top level of the module, which may be a raw number the interpreter stored
+  def get_member(self, name):
+    value = self.symbol_table.symbols.get(name)
+    if value is None:
+      return None, RTError(
+        self.pos_start, self.pos_end,
+        f"Module \"{self.name}\" has no member '{name}'",
+        self.context
+      )
+    return value, None
+
+  # Create a copy of the current Module, sharing its symbol table
+  def copy(self):
+    copy = Module(self.name, self.symbol_table)
+    copy.set_pos(self.pos_start, self.pos_end)
+    copy.set_context(self.context)
+    return copy
+
+  # Modules are always truthy
+  def is_true(self):
+    return True
+
+  # Representation of the Module object
+  def __repr__(self):
+    return f'<module {self.name}>'
+
 # BaseFunction class representing the base class for all functions
 class BaseFunction(Value):
   # Initialize the BaseFunction object with a name
   def __init__(self, name):
     super().__init__()
     self.name = name or "<anonymous>"
+    self.namespace = None # Top level symbol table of the program or module defining the function, None for builtins
 
   # Generate a new context for function execution
   def generate_new_context(self):
     new_context = Context(self.name, self.context, self.pos_start)
-    new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
+    new_context.symbol_table = self.new_symbol_table(self.outer_table(new_context.parent.symbol_table))
     return new_context
 
-  # Check if the number of arguments passed matches the expected number
-  def check_args(self, arg_names, args):
+  # Set the namespace of a function from the context it is defined in
+  def set_namespace(self, context):
+    self.namespace = context.symbol_table.namespace
+    return self
+
+  # Symbol table a call looks up the names it does not bind in: the caller's, unless the caller runs in another namespace
+  # A function of a module called from outside it then still sees the other names of its module
+  def outer_table(self, caller_table):
+    if self.namespace is None or caller_table.namespace is self.namespace:
+      return caller_table
+    return self.namespace
+
+  # Create the symbol table of a call, overridden by functions whose locals were resolved to frame slots
+  def new_symbol_table(self, parent):
+    return SymbolTable(parent)
+
+  # Check if the number of arguments passed matches the expected number, the optional ones being allowed to be left out
+  def check_args(self, arg_names, args, optional_arg_names=()):
     res = RTResult()
 
-    if len(args) > len(arg_names):
+    if len(args) > len(arg_names) + len(optional_arg_names):
       return res.failure(RTError(
         self.pos_start, self.pos_end,
-        f"{len(args) - len(arg_names)} too many args passed into {self}",
+        f"{len(args) - len(arg_names) - len(optional_arg_names)} too many args passed into {self}",
         self.context
       ))
 
@@ -1895,14 +2831,21 @@ class BaseFunction(Value):
       arg_value.set_context(exec_ctx)
       exec_ctx.symbol_table.set(arg_name, arg_value)
 
-  # Check arguments and populate them in the symbol table
-  def check_and_populate_args(self, arg_names, args, exec_ctx):
+  # Check arguments and populate them in the symbol table, optional arguments that are left out are not set
+  def check_and_populate_args(self, arg_names, args, exec_ctx, optional_arg_names=()):
     res = RTResult()
-    res.register(self.check_args(arg_names, args))
+    res.register(self.check_args(arg_names, args, optional_arg_names))
     if res.should_return(): return res
+    if optional_arg_names: arg_names = [*arg_names, *optional_arg_names]
     self.populate_args(arg_names, args, exec_ctx)
     return res.success(None)
 
+  # Make a Python function calling this function from a context at a call site, for builtins calling it many times
+  # It takes a list of argument Values and returns a Value, raising a signal when the call fails or escapes
+  def callback(self, context, pos_start, pos_end):
+    function = self.copy().set_pos(pos_start, pos_end).set_context(context)
+    return lambda args: unwrap_result(function.execute(args))
+
 # Function class representing user-defined functions
 class Function(BaseFunction):
   # Initialize the Function object with a name, body node, argument names, and auto-return flag
@@ -1914,24 +2857,46 @@ class Function(BaseFunction):
 
   # Execute the function with the given arguments
   def execute(self, args):
-    res = RTResult()
-    interpreter = Interpreter()
-    exec_ctx = self.generate_new_context()
+    res = catch_signals(self.call, args, self.context, self.pos_start, self.pos_end)
+    res.value = box_value(res.value)
+    return res
 
-    res.register(self.check_and_populate_args(self.arg_names, args, exec_ctx))
-    if res.should_return(): return res
+  # Call the function from a caller context at a call site, returning its value and raising a signal for errors and escaping HUNONG or UNAHAN
+  # Numbers go in and come out raw, the way the interpreter keeps them
+  def call(self, args, context, pos_start, pos_end):
+    # Argument count errors point at the call site, so a copy placed there reports them
+    if len(args) != len(self.arg_names):
+      unwrap_result(self.copy().set_pos(pos_start, pos_end).set_context(context).check_args(self.arg_names, args))
 
-    value = res.register(interpreter.visit(self.body_node, exec_ctx))
-    if res.should_return() and res.func_return_value == None: return res
+    function = self
+    interpreter = Interpreter()
+    while True:
+      exec_ctx = Context(function.name, context, pos_start)
+      exec_ctx.symbol_table = function.new_symbol_table(function.outer_table(context.symbol_table))
+      for arg_name, arg_value in zip(function.arg_names, args):
+        exec_ctx.symbol_table.set(arg_name, unbox_value(arg_value))
 
-    ret_value = (value if self.should_auto_return else None) or res.func_return_value or Number.null
-    return res.success(ret_value)
+      try:
+        if not function.should_auto_return:
+          interpreter.visit_discarded(function.body_node, exec_ctx)
+          return 0
+        return interpreter.visit(function.body_node, exec_ctx)
+      except ReturnSignal as signal:
+        return signal.value
+      except TailCallSignal as signal:
+        # The tail call is made in place of this one, as if from the same caller and call site
+        function, args = signal.function, signal.args
+
+  # Make a Python function calling this function, straight through call without a copy or a runtime result
+  def callback(self, context, pos_start, pos_end):
+    return lambda args: box_value(self.call(args, context, pos_start, pos_end))
 
   # Create a copy of the current Function
   def copy(self):
     copy = Function(self.name, self.body_node, self.arg_names, self.should_auto_return)
     copy.set_context(self.context)
     copy.set_pos(self.pos_start, self.pos_end)
+    copy.namespace = self.namespace
     return copy
 
   # Representation of the Function object
@@ -1948,13 +2913,13 @@ class BuiltInFunction(BaseFunction):
     res = RTResult()
     exec_ctx = self.generate_new_context()
 
-    method_name = f'execute_{self.name}'
-    method = getattr(self, method_name, self.no_visit_method)
+    method = self.methods[self.name]
 
-    res.register(self.check_and_populate_args(method.arg_names, args, exec_ctx))
+    optional_arg_names = getattr(method, 'optional_arg_names', ())
+    res.register(self.check_and_populate_args(method.arg_names, args, exec_ctx, optional_arg_names))
     if res.should_return(): return res
 
-    return_value = res.register(method(exec_ctx))
+    return_value = res.register(method(self, exec_ctx))
     if res.should_return(): return res
     return res.success(return_value)
 
@@ -2046,7 +3011,7 @@ class BuiltInFunction(BaseFunction):
         exec_ctx
       ))
 
-    list_.elements.append(value)
+    list_.append(value)
     return RTResult().success(Number.null)
   execute_append.arg_names = ["list", "value"]
 
@@ -2070,7 +3035,7 @@ class BuiltInFunction(BaseFunction):
       ))
 
     try:
-      element = list_.elements.pop(index.value)
+      element = list_.pop(index.value)
     except:
       return RTResult().failure(RTError(
         self.pos_start, self.pos_end,
@@ -2099,28 +3064,249 @@ class BuiltInFunction(BaseFunction):
         exec_ctx
       ))
 
-    listA.elements.extend(listB.elements)
+    listA.extend(listB)
     return RTResult().success(Number.null)
   execute_extend.arg_names = ["listA", "listB"]
 
-  # Get the length of 'list' or 'string'
+  # Get the length of 'list', 'string', map or set
   def execute_len(self, exec_ctx):
     list_ = exec_ctx.symbol_table.get("list")
 
-    if not isinstance(list_, List) and not isinstance(list_, String):
+    if not isinstance(list_, (List, String, HashedValue)):
       return RTResult().failure(RTError(
         self.pos_start, self.pos_end,
-        "Argument must be list or string",
+        "Argument must be list, string, map or set",
         exec_ctx
       ))
 
     if isinstance(list_, List):
-      return RTResult().success(Number(len(list_.elements)))
+      return RTResult().success(Number(list_.length))
+
+    if isinstance(list_, HashedValue):
+      return RTResult().success(Number(len(list_.table)))
 
     return RTResult().success(Number(len(list_.value)))
   execute_len.arg_names = ["list"]
 
-  # Execute a script specified by the 'fn' variable in the symbol table
+  # Get the keys of 'map', or the elements of a set, as a List
+  def execute_keys(self, exec_ctx):
+    map_ = exec_ctx.symbol_table.get("map")
+
+    if isinstance(map_, Map):
+      return RTResult().success(List(map_.keys()))
+
+    if isinstance(map_, Set):
+      return RTResult().success(List(map_.items()))
+
+    return RTResult().failure(RTError(
+      self.pos_start, self.pos_end,
+      "Argument must be map or set",
+      exec_ctx
+    ))
+  execute_keys.arg_names = ["map"]
+
+  # Get the values of 'map' as a List
+  def execute_values(self, exec_ctx):
+    map_ = exec_ctx.symbol_table.get("map")
+
+    if not isinstance(map_, Map):
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "Argument must be map",
+        exec_ctx
+      ))
+
+    return RTResult().success(List(map_.values()))
+  execute_values.arg_names = ["map"]
+
+  # Check if 'value' is a key of 'collection', or an element of it when it is a set
+  def execute_contains(self, exec_ctx):
+    collection = exec_ctx.symbol_table.get("collection")
+    value = exec_ctx.symbol_table.get("value")
+
+    if not isinstance(collection, HashedValue):
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "First argument must be map or set",
+        exec_ctx
+      ))
+
+    hashed = hash_key(value)
+    return RTResult().success(Number.true if hashed is not None and hashed in collection.table else Number.false)
+  execute_contains.arg_names = ["collection", "value"]
+
+  # Make a Set of the elements of 'list'
+  def execute_to_set(self, exec_ctx):
+    list_ = exec_ctx.symbol_table.get("list")
+
+    if not isinstance(list_, List):
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "Argument must be list",
+        exec_ctx
+      ))
+
+    set_, index = make_set(list_.elements)
+    if set_ is None:
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "Elements must be numbers or strings",
+        exec_ctx
+      ))
+    return RTResult().success(set_)
+  execute_to_set.arg_names = ["list"]
+
+  # Make a Python function calling 'fn' as if from the caller of the builtin, so it does not see the builtin's arguments
+  def caller_callback(self, fn, exec_ctx):
+    return fn.callback(exec_ctx.parent, self.pos_start, self.pos_end)
+
+  # Error of the arguments of a builtin taking a list and a function, None when they are right
+  def list_and_function_error(self, list_, fn, exec_ctx):
+    if not isinstance(list_, List):
+      return RTError(
+        self.pos_start, self.pos_end,
+        "First argument must be list",
+        exec_ctx
+      )
+
+    if not isinstance(fn, BaseFunction):
+      return RTError(
+        self.pos_start, self.pos_end,
+        "Second argument must be function",
+        exec_ctx
+      )
+    return None
+
+  # Return a List of what 'fn' returns for each element of 'list'
+  def execute_map(self, exec_ctx):
+    list_ = exec_ctx.symbol_table.get("list")
+    fn = exec_ctx.symbol_table.get("fn")
+
+    error = self.list_and_function_error(list_, fn, exec_ctx)
+    if error: return RTResult().failure(error)
+
+    call = self.caller_callback(fn, exec_ctx)
+    elements = list_.elements[:]
+    return catch_signals(lambda: List([call([element]) for element in elements]))
+  execute_map.arg_names = ["list", "fn"]
+
+  # Return a List of the elements of 'list' for which 'fn' returns a true value
+  def execute_filter(self, exec_ctx):
+    list_ = exec_ctx.symbol_table.get("list")
+    fn = exec_ctx.symbol_table.get("fn")
+
+    error = self.list_and_function_error(list_, fn, exec_ctx)
+    if error: return RTResult().failure(error)
+
+    call = self.caller_callback(fn, exec_ctx)
+    elements = list_.elements[:]
+    return catch_signals(lambda: List([element for element in elements if call([element]).is_true()]))
+  execute_filter.arg_names = ["list", "fn"]
+
+  # Combine the elements of 'list' from the left by calling 'fn' on the result so far and the next element,
+  # starting from 'initial', or from the first element when it is left out
+  def execute_reduce(self, exec_ctx):
+    list_ = exec_ctx.symbol_table.get("list")
+    fn = exec_ctx.symbol_table.get("fn")
+    initial = exec_ctx.symbol_table.symbols.get("initial") # Looked up here only, as it may be left out
+
+    error = self.list_and_function_error(list_, fn, exec_ctx)
+    if error: return RTResult().failure(error)
+
+    elements = list_.elements[:]
+    if initial is None:
+      if not elements:
+        return RTResult().failure(RTError(
+          self.pos_start, self.pos_end,
+          "Empty list has no first element to start from without an initial value",
+          exec_ctx
+        ))
+      initial = elements.pop(0)
+
+    call = self.caller_callback(fn, exec_ctx)
+
+    def reduce_():
+      value = initial
+      for element in elements:
+        value = call([value, element])
+      return value
+    return catch_signals(reduce_)
+  execute_reduce.arg_names = ["list", "fn"]
+  execute_reduce.optional_arg_names = ["initial"]
+
+  # Return a List of the elements of 'list' in ascending order of themselves, or of what 'key' returns for them,
+  # equal ones keeping their order
+  def execute_sort(self, exec_ctx):
+    list_ = exec_ctx.symbol_table.get("list")
+    key = exec_ctx.symbol_table.symbols.get("key") # Looked up here only, as it may be left out
+
+    if not isinstance(list_, List):
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "First argument must be list",
+        exec_ctx
+      ))
+
+    if key is not None and not isinstance(key, BaseFunction):
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "Second argument must be function",
+        exec_ctx
+      ))
+
+    elements = list_.elements[:]
+    keys = elements
+    if key is not None:
+      call = self.caller_callback(key, exec_ctx)
+      res = catch_signals(lambda: [call([element]) for element in elements])
+      if res.should_return(): return res
+      keys = res.value
+
+    # The keys are compared as host numbers and strings
+    sort_keys = [value.value if isinstance(value, (Number, String)) else None for value in keys]
+    try:
+      if None in sort_keys: raise TypeError
+      order = sorted(range(len(elements)), key=sort_keys.__getitem__)
+    except TypeError:
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "Elements must all be numbers or all be strings" if key is None else "Keys must all be numbers or all be strings",
+        exec_ctx
+      ))
+    return RTResult().success(List([elements[index] for index in order]))
+  execute_sort.arg_names = ["list"]
+  execute_sort.optional_arg_names = ["key"]
+
+  # Return a List of the numbers from 'start' up to but not including 'end' counting by 'step', like a PARA loop,
+  # or from 0 up to 'start' when it is the only argument
+  def execute_range(self, exec_ctx):
+    start = exec_ctx.symbol_table.get("start")
+    end = exec_ctx.symbol_table.symbols.get("end") # Looked up here only, as they may be left out
+    step = exec_ctx.symbol_table.symbols.get("step")
+
+    if end is None: start, end = Number(0), start
+    if step is None: step = Number(1)
+
+    if not all(isinstance(value, Number) for value in (start, end, step)):
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "Arguments must be numbers",
+        exec_ctx
+      ))
+
+    if step.value == 0:
+      return RTResult().failure(RTError(
+        self.pos_start, self.pos_end,
+        "Step must not be zero",
+        exec_ctx
+      ))
+
+    return RTResult().success(List([Number(i) for i in python_range(start.value, end.value, step.value)]))
+  execute_range.arg_names = ["start"]
+  execute_range.optional_arg_names = ["end", "step"]
+
+  # Load the script specified by the 'fn' variable in the symbol table as a module and return it
+  # A script already loaded and unchanged since is not read or executed again
   def execute_run(self, exec_ctx):
     fn = exec_ctx.symbol_table.get("fn")
 
@@ -2134,17 +3320,14 @@ class BuiltInFunction(BaseFunction):
     fn = fn.value
 
     try:
-      with open(fn, "r") as f:
-        script = f.read()
-    except Exception as e:
+      module, error = load_module(fn, exec_ctx.program_engine())
+    except (OSError, UnicodeError) as e:
       return RTResult().failure(RTError(
         self.pos_start, self.pos_end,
         f"Failed to load script \"{fn}\"\n" + str(e),
         exec_ctx
       ))
 
-    _, error = run(fn, script)
-
     if error:
       return RTResult().failure(RTError(
         self.pos_start, self.pos_end,
@@ -2153,9 +3336,12 @@ class BuiltInFunction(BaseFunction):
         exec_ctx
       ))
 
-    return RTResult().success(Number.null)
+    return RTResult().success(module)
   execute_run.arg_names = ["fn"]
 
+# Builtin name -> execute method, filled in the first time each builtin is called
+BuiltInFunction.methods = DispatchTable(BuiltInFunction, lambda name: f'execute_{name}', BuiltInFunction.no_visit_method)
+
 # Instantiate built-in functions
 BuiltInFunction.print       = BuiltInFunction("print")
 BuiltInFunction.print_ret   = BuiltInFunction("print_ret")
@@ -2170,6 +3356,15 @@ BuiltInFunction.append      = BuiltInFunction("append")
 BuiltInFunction.pop         = BuiltInFunction("pop")
 BuiltInFunction.extend      = BuiltInFunction("extend")
 BuiltInFunction.len					= BuiltInFunction("len")
+BuiltInFunction.keys        = BuiltInFunction("keys")
+BuiltInFunction.values      = BuiltInFunction("values")
+BuiltInFunction.contains    = BuiltInFunction("contains")
+BuiltInFunction.to_set      = BuiltInFunction("to_set")
+BuiltInFunction.map         = BuiltInFunction("map")
+BuiltInFunction.filter      = BuiltInFunction("filter")
+BuiltInFunction.reduce      = BuiltInFunction("reduce")
+BuiltInFunction.sort        = BuiltInFunction("sort")
+BuiltInFunction.range       = BuiltInFunction("range")
 BuiltInFunction.run					= BuiltInFunction("run")
 
 #------------------------------#
@@ -2178,12 +3373,20 @@ BuiltInFunction.run					= BuiltInFunction("run")
 
 # Represents the context in which a statement or expression is executed
 class Context:
+  engine = 'interpreter' # Engine running the program, set by run() on the context of the program
+
   def __init__(self, display_name, parent=None, parent_entry_pos=None):
     self.display_name = display_name
     self.parent = parent
     self.parent_entry_pos = parent_entry_pos
     self.symbol_table = None
 
+  # The engine running the program the context is part of
+  def program_engine(self):
+    context = self
+    while context.parent: context = context.parent
+    return context.engine
+
 #------------------------------#
 # SYMBOL TABLE
 #------------------------------#
@@ -2194,6 +3397,12 @@ class SymbolTable:
     self.symbols = {} # Dictionary to store symbol-value pairs
     self.parent = parent # Reference to the parent symbol table
 
+    # Top level table of the program or module the table belongs to, a table without a parent being its own
+    self.namespace = parent.namespace if parent else self
+
+    # Names resolved for the programs run under the same table without a parent, whose functions can call each other
+    self.names = parent.names if parent else ResolvedNames()
+
   # Get the value of a symbol by name, checking in the current and parent symbol tables
   def get(self, name):
     value = self.symbols.get(name, None)
@@ -2209,294 +3418,2367 @@ class SymbolTable:
   def remove(self, name):
     del self.symbols[name]
 
+# Symbol table of a function call whose resolved locals are stored in a list indexed by slot
+class Frame(SymbolTable):
+  def __init__(self, scope, parent):
+    super().__init__(parent)
+    self.scope = scope
+    self.values = [None] * len(scope.names) # None marks a local not assigned yet
+
+    # Nearest enclosing table that is not a frame, where names no frame binds are looked up directly
+    self.root = parent.root if isinstance(parent, Frame) else parent
+
+  # Get a symbol from its slot, falling back to the symbols dictionary and the parent tables
+  def get(self, name):
+    slot = self.scope.slots.get(name)
+    if slot is not None and self.values[slot] is not None:
+      return self.values[slot]
+    value = self.symbols.get(name, None)
+    if value == None and self.parent:
+      return self.parent.get(name)
+    return value
+
+  # Set a symbol in its slot, or in the symbols dictionary when it has none
+  def set(self, name, value):
+    slot = self.scope.slots.get(name)
+    if slot is None:
+      self.symbols[name] = value
+    else:
+      self.values[slot] = value
+
+  # Remove a symbol from its slot or from the symbols dictionary
+  def remove(self, name):
+    slot = self.scope.slots.get(name)
+    if slot is None:
+      del self.symbols[name]
+    else:
+      self.values[slot] = None
+
+  # Get a name that no frame binds, skipping the frames between this one and the root
+  def get_global(self, name):
+    if name in self.names.bound:
+      return self.get(name)
+    return self.root.get(name)
+
+#------------------------------#
+# RESOLVER
+#------------------------------#
+
+# Names the resolved functions of one or more programs bind and read
+class ResolvedNames:
+  def __init__(self, bound=(), free=()):
+    self.bound = set(bound) # Every name bound as a local of some function; a name outside this set is never stored in a Frame
+    self.free = set(free)   # Every name some function reads without binding it, which may be found in the frame of one of its callers
+
+  # Add the names of another program
+  def update(self, other):
+    self.bound.update(other.bound)
+    self.free.update(other.free)
+
+# A tail call may drop the frame of the function making it only when no function can read a name of that frame from there
+def can_drop_frame(symbol_table):
+  free_names = symbol_table.names.free
+  if isinstance(symbol_table, Frame) and not free_names.isdisjoint(symbol_table.scope.names): return False
+  return free_names.isdisjoint(symbol_table.symbols)
+
+# Local names of a function body and their frame slots
+class Scope:
+  def __init__(self, names):
+    self.names = names
+    self.slots = {name: slot for slot, name in enumerate(names)}
+
+class Resolver:
+  # Assign frame slots to the local names of every function in a program, returning the names they bind and read
+  # The tree is walked with an explicit stack of nodes and the scope of the function each is in, so deep expressions fit
+  def resolve(self, node):
+    self.names = ResolvedNames()
+    nodes = [(node, None)]
+
+    while nodes:
+      node, scope = nodes.pop()
+
+      if isinstance(node, FuncDefNode):
+        nodes.append((node.body_node, self.resolve_function(node, scope)))
+        continue
+
+      if isinstance(node, (VarAccessNode, VarAssignNode, ForNode)):
+        node.slot = self.slot(scope, node.var_name_tok.value)
+        if scope and node.slot is None and isinstance(node, VarAccessNode):
+          self.names.free.add(node.var_name_tok.value)
+
+      nodes.extend((child, scope) for child in reversed(list(iter_child_nodes(node))))
+
+    return self.names
+
+  # Return the slot of a name in a function scope, or None at the top level and for free names
+  def slot(self, scope, name):
+    if scope is None: return None
+    return scope.slots.get(name)
+
+  # Give a function body its own scope made of its arguments and the names it assigns, returning that scope
+  def resolve_function(self, node, enclosing_scope):
+    if node.var_name_tok:
+      node.slot = self.slot(enclosing_scope, node.var_name_tok.value)
+
+    names = [arg_name_tok.value for arg_name_tok in node.arg_name_toks]
+    self.collect_names(node.body_node, names)
+    self.names.bound.update(names)
+    node.scope = Scope(names)
+    return node.scope
+
+  # Collect the names a body assigns in the order they appear, without entering nested function bodies
+  def collect_names(self, node, names):
+    nodes = [node]
+    while nodes:
+      node = nodes.pop()
+
+      name_tok = None
+      if isinstance(node, (VarAssignNode, ForNode)):
+        name_tok = node.var_name_tok
+      elif isinstance(node, FuncDefNode):
+        name_tok = node.var_name_tok
+
+      if name_tok and name_tok.value not in names:
+        names.append(name_tok.value)
+      if isinstance(node, FuncDefNode): continue
+
+      nodes.extend(reversed(list(iter_child_nodes(node))))
+
+#------------------------------#
+# OPTIMIZER
+#------------------------------#
+
+# Read-only globals inlined as literals when nothing in the program rebinds them
+INLINE_CONSTANTS = {
+  'WA': Number.null,
+  'NGI': Number.false,
+  'OO': Number.true,
+  'MATH_PI': Number.math_PI,
+}
+
+# Folded strings longer than this, and integers with more bits, are left for runtime
+FOLD_SIZE_LIMIT = 4096
+
+# Set to keep every call in tracebacks, tail calls otherwise replace the call of the function making them
+FULL_TRACEBACKS = False
+
+# The builtin constants a program run in the global symbol table may inline, those still holding their builtin value
+# that no function run there binds. There are none unless the program sees every binding of the names it uses,
+# which a line of the interactive shell does not, as later lines can call its functions, and neither does a
+# module, whose functions the program loading it calls; a program loading modules inlines none either
+def inlinable_constants(fn, symbol_table=None):
+  if fn == '<stdin>' or symbol_table is not None: return {}
+  return {
+    name: value for name, value in INLINE_CONSTANTS.items()
+    if global_symbol_table.symbols.get(name) is value and name not in global_symbol_table.names.bound
+  }
+
+class Optimizer:
+  # Fold constant subtrees and inline the given read-only globals, returning the optimized program node
+  # When keep_result is false the value of the program itself is thrown away by the caller
+  def optimize(self, node, keep_result=True, constants=None):
+    self.mark_unused_values(node, keep_result)
+
+    assigned_names = set()
+    self.collect_assigned_names(node, assigned_names)
+
+    # A constant is inlined only when the program itself cannot rebind it either
+    self.constants = {name: value for name, value in (constants or {}).items() if name not in assigned_names}
+    node = self.visit(node)
+
+    if not FULL_TRACEBACKS: self.mark_tail_calls(node)
+    return node
+
+  # Mark the loops and KUNG expressions whose value is never used so they skip collecting results
+  # Nodes wait on a stack with whether their value is used, so deep expressions do not exhaust Python's stack
+  def mark_unused_values(self, node, used):
+    nodes = [(node, used)]
+    while nodes:
+      node, used = nodes.pop()
+
+      if isinstance(node, (ForNode, WhileNode)):
+        if not used: node.should_return_null = True
+        for child in iter_child_nodes(node):
+          nodes.append((child, child is not node.body_node or not node.should_return_null))
+
+      elif isinstance(node, IfNode):
+        cases = []
+        for condition, expr, should_return_null in node.cases:
+          should_return_null = should_return_null or not used
+          nodes.append((condition, True))
+          nodes.append((expr, not should_return_null))
+          cases.append((condition, expr, should_return_null))
+        node.cases = cases
+
+        if node.else_case:
+          expr, should_return_null = node.else_case
+          should_return_null = should_return_null or not used
+          nodes.append((expr, not should_return_null))
+          node.else_case = (expr, should_return_null)
+
+      elif isinstance(node, FuncDefNode):
+        # Without auto return only BALIK gives the call its value
+        nodes.append((node.body_node, node.should_auto_return))
+
+      elif isinstance(node, ListNode):
+        # The elements of a list, or the statements of a block, matter only when the list does
+        for element_node in node.element_nodes:
+          nodes.append((element_node, used))
+
+      else:
+        for child in iter_child_nodes(node):
+          nodes.append((child, True))
+
+  # Mark the calls whose value their function returns as it is: a BALIK value, an arrow body or a KUNG branch giving either
+  # Calls in a loop are left alone, as HUNONG or UNAHAN escaping the callee must still reach the loop around the call
+  # Nodes wait on a stack with whether they are in tail position, in a loop and in a function body
+  def mark_tail_calls(self, node):
+    nodes = [(node, False, False, False)]
+    while nodes:
+      node, tail, in_loop, in_function = nodes.pop()
+
+      if isinstance(node, FuncDefNode):
+        nodes.append((node.body_node, node.should_auto_return, False, True))
+        continue
+
+      if isinstance(node, CallNode):
+        node.tail = tail
+      elif isinstance(node, ReturnNode):
+        # BALIK outside a function body has no call to hand a tail call to
+        if node.node_to_return: nodes.append((node.node_to_return, in_function and not in_loop, in_loop, in_function))
+        continue
+      elif isinstance(node, IfNode):
+        for condition, expr, should_return_null in node.cases:
+          nodes.append((condition, False, in_loop, in_function))
+          nodes.append((expr, tail and not should_return_null, in_loop, in_function))
+        if node.else_case:
+          expr, should_return_null = node.else_case
+          nodes.append((expr, tail and not should_return_null, in_loop, in_function))
+        continue
+      elif isinstance(node, (ForNode, WhileNode)):
+        in_loop = True
+
+      for child in iter_child_nodes(node):
+        nodes.append((child, False, in_loop, in_function))
+
+  # Collect every name the program assigns, declares as a loop variable, function or argument
+  def collect_assigned_names(self, node, names):
+    nodes = [node]
+    while nodes:
+      node = nodes.pop()
+      if isinstance(node, (VarAssignNode, ForNode)):
+        names.add(node.var_name_tok.value)
+      elif isinstance(node, FuncDefNode):
+        if node.var_name_tok: names.add(node.var_name_tok.value)
+        names.update(arg_name_tok.value for arg_name_tok in node.arg_name_toks)
+      nodes.extend(iter_child_nodes(node))
+
+  # Optimize the children of every node before the node itself, returning the optimized tree
+  # The nodes are listed parents first with an explicit stack and optimized in reverse, so deep expressions fit
+  def visit(self, node):
+    order = []
+    nodes = [node]
+    while nodes:
+      current = nodes.pop()
+      order.append(current)
+      nodes.extend(iter_child_nodes(current))
+
+    # Optimized nodes by the id of the node they replace, every original node stays alive in order meanwhile
+    optimized = {}
+    for current in reversed(order):
+      transform_child_nodes(current, lambda child: optimized.get(id(child), child))
+      optimized[id(current)] = self.optimize_node(current)
+    return optimized[id(node)]
+
+  # Optimize a node whose children are already optimized
+  def optimize_node(self, node):
+    if isinstance(node, VarAccessNode):
+      return self.inline_constant(node)
+    if isinstance(node, BinOpNode):
+      return self.fold_binary(node)
+    if isinstance(node, UnaryOpNode):
+      return self.fold_unary(node)
+    return node
+
+  # Replace an access to a read-only global with its literal value
+  def inline_constant(self, node):
+    value = self.constants.get(node.var_name_tok.value)
+    if value is None: return node
+    return self.literal_node(value, node)
+
+  # Fold a binary operation between two literals, unless it fails and must report its error at runtime
+  def fold_binary(self, node):
+    left = self.literal_value(node.left_node)
+    right = self.literal_value(node.right_node)
+    if left is None or right is None: return node
+
+    method_name = node.operator.method_name
+
+    # Large powers are computed at runtime, only if the program actually gets there
+    if method_name == 'powed_by' and isinstance(right.value, int) and abs(right.value) > 64:
+      return node
+
+    # So is a repeated string that would be too long to fold, which is never built only to be thrown away
+    if method_name == 'multed_by' and isinstance(left, String) and isinstance(right, Number) and len(left.value) * right.value > FOLD_SIZE_LIMIT:
+      return node
+
+    try:
+      result, error = getattr(left, method_name)(right)
+    except Exception:
+      return node
+    if error: return node
+    return self.literal_node(result, node)
+
+  # Fold a negation or DILI of a number literal
+  def fold_unary(self, node):
+    value = self.literal_value(node.node)
+    if not isinstance(value, Number): return node
+
+    if node.op_tok.type == TT_KWAI:
+      result, _ = value.multed_by(Number(-1))
+    elif node.op_tok.matches(TT_KEYWORD, 'DILI'):
+      result, _ = value.notted()
+    else:
+      result = value
+    return self.literal_node(result, node)
+
+  # Return the value of a number or string literal node, or None for any other node
+  def literal_value(self, node):
+    if isinstance(node, NumberNode): return Number(node.tok.value)
+    if isinstance(node, StringNode): return String(node.tok.value)
+    return None
+
+  # Build a literal node holding a folded value, spanning the node it replaces
+  def literal_node(self, value, node):
+    if isinstance(value, String):
+      if len(value.value) > FOLD_SIZE_LIMIT: return node
+      return StringNode(Token(TT_TIBUOK, value.value, node.pos_start, node.pos_end))
+
+    if isinstance(value, Number):
+      if isinstance(value.value, int) and value.value.bit_length() > FOLD_SIZE_LIMIT: return node
+      tok_type = TT_KWARTA if isinstance(value.value, int) else TT_SINSILYO
+      return NumberNode(Token(tok_type, value.value, node.pos_start, node.pos_end))
+
+    return node
+
 #------------------------------#
 # INTERPRETER
 #------------------------------#
 
+# Numbers, including the null value 0, are raw Python scalars while the interpreter works on them
+# Values are shared rather than copied and carry no positions, the spans of the nodes are used when an error is reported
 class Interpreter:
-  # Visit a specific node based on its type
+  # Visit a specific node through the dispatch table of its type, returning its value or raising a signal
   def visit(self, node, context):
-    method_name = f'visit_{type(node).__name__}'
-    method = getattr(self, method_name, self.no_visit_method)
-    return method(node, context)
+    return self.dispatch[type(node)](self, node, context)
 
   # Error handling for undefined visit methods
   def no_visit_method(self, node, context):
     raise Exception(f'No visit_{type(node).__name__} method defined')
 
+  # Interpret a program and turn the signal it ends with into a runtime result
+  def run(self, node, context):
+    res = catch_signals(self.visit, node, context)
+    res.value = box_value(res.value)
+    return res
+
+  # Visit a node whose value is thrown away, running the statements of a block without collecting them
+  def visit_discarded(self, node, context):
+    if isinstance(node, ListNode):
+      for element_node in node.element_nodes:
+        self.visit(element_node, context)
+    else:
+      self.visit(node, context)
+
   ###################################
 
-  # Visit a NumberNode and create a corresponding Number value
+  # Visit a NumberNode, its value needs no Number until it is stored in a list or passed to a builtin
   def visit_NumberNode(self, node, context):
-    return RTResult().success(
-      Number(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
-    )
+    return node.tok.value
 
   # Visit a StringNode and create a corresponding String value
   def visit_StringNode(self, node, context):
-    return RTResult().success(
-      String(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
-    )
+    return String(node.tok.value)
 
-  # Visit a ListNode and create a corresponding List value
+  # Visit a ListNode and create a corresponding List value, whose elements are always Values
   def visit_ListNode(self, node, context):
-    res = RTResult()
-    elements = []
-
-    for element_node in node.element_nodes:
-      elements.append(res.register(self.visit(element_node, context)))
-      if res.should_return(): return res
-
-    return res.success(
-      List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-    )
-
-  # Visit a VarAccessNode and retrieve the value from the symbol table
+    return List([box_value(self.visit(element_node, context)) for element_node in node.element_nodes])
+
+  # Visit a MapNode and create a corresponding Map value, whose keys and values are always Values
+  def visit_MapNode(self, node, context):
+    keys = []
+    values = []
+    for key_node, value_node in zip(node.key_nodes, node.value_nodes):
+      keys.append(box_value(self.visit(key_node, context)))
+      values.append(box_value(self.visit(value_node, context)))
+
+    map_, index = make_map(keys, values)
+    if map_ is None:
+      key_node = node.key_nodes[index]
+      raise ErrorSignal(unhashable_error(key_node.pos_start, key_node.pos_end, context))
+    return map_
+
+  # Visit a SetNode and create a corresponding Set value, whose elements are always Values
+  def visit_SetNode(self, node, context):
+    set_, index = make_set([box_value(self.visit(element_node, context)) for element_node in node.element_nodes])
+    if set_ is None:
+      element_node = node.element_nodes[index]
+      raise ErrorSignal(unhashable_error(element_node.pos_start, element_node.pos_end, context))
+    return set_
+
+  # Visit a VarAccessNode and return the value stored in the symbol table
   def visit_VarAccessNode(self, node, context):
-    res = RTResult()
     var_name = node.var_name_tok.value
     value = context.symbol_table.get(var_name)
 
-    if not value:
-      return res.failure(RTError(
+    if value is None:
+      raise ErrorSignal(RTError(
         node.pos_start, node.pos_end,
         f"'{var_name}' is not defined",
         context
       ))
 
-    value = value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
-    return res.success(value)
+    if type(value) is Number: return value.value
+    return value
 
   # Visit a VarAssignNode, evaluate the assigned value, and set it in the symbol table
   def visit_VarAssignNode(self, node, context):
-    res = RTResult()
     var_name = node.var_name_tok.value
-    value = res.register(self.visit(node.value_node, context))
-    if res.should_return(): return res
-
+    value = self.visit(node.value_node, context)
     context.symbol_table.set(var_name, value)
-    return res.success(value)
+    return value
 
   # Visit a Binary Operation Node, evaluate left and right operands, and perform the corresponding operation
   def visit_BinOpNode(self, node, context):
-    res = RTResult()
-    left = res.register(self.visit(node.left_node, context))
-    if res.should_return(): return res
-    right = res.register(self.visit(node.right_node, context))
-    if res.should_return(): return res
-
-    # Determine the operation based on the operator token type
-    if node.op_tok.type == TT_DUGANG:
-      result, error = left.added_to(right)
-    elif node.op_tok.type == TT_KWAI:
-      result, error = left.subbed_by(right)
-    elif node.op_tok.type == TT_DAGHANON:
-      result, error = left.multed_by(right)
-    elif node.op_tok.type == TT_BAHIN:
-      result, error = left.dived_by(right)
-    elif node.op_tok.type == TT_KAPILAON:
-      result, error = left.powed_by(right)
-    elif node.op_tok.type == TT_EE:
-      result, error = left.get_comparison_eq(right)
-    elif node.op_tok.type == TT_NE:
-      result, error = left.get_comparison_ne(right)
-    elif node.op_tok.type == TT_LT:
-      result, error = left.get_comparison_lt(right)
-    elif node.op_tok.type == TT_GT:
-      result, error = left.get_comparison_gt(right)
-    elif node.op_tok.type == TT_LTE:
-      result, error = left.get_comparison_lte(right)
-    elif node.op_tok.type == TT_GTE:
-      result, error = left.get_comparison_gte(right)
-    elif node.op_tok.matches(TT_KEYWORD, 'UG'):
-      result, error = left.anded_by(right)
-    elif node.op_tok.matches(TT_KEYWORD, 'KUN'):
-      result, error = left.ored_by(right)
-
-    # Handle errors and return the result
-    if error:
-      return res.failure(error)
-    else:
-      return res.success(result.set_pos(node.pos_start, node.pos_end))
+    left = self.visit(node.left_node, context)
+    right = self.visit(node.right_node, context)
+    operator = node.operator
+
+    # Raw numbers are computed directly, division by zero is the only error they can report
+    if type(left) in RAW_NUMBER_TYPES and type(right) in RAW_NUMBER_TYPES:
+      if right == 0 and node.op_key == TT_BAHIN:
+        raise ErrorSignal(RTError(
+          node.right_node.pos_start, node.right_node.pos_end,
+          'Division by zero',
+          context
+        ))
+      return operator.number_fn(left, right)
+
+    # Any other operand is boxed for the Value method, which is given the source spans only if it fails
+    return unbox_value(shared_binary_op(
+      operator.method_name, box_value(left), box_value(right),
+      (node.left_node.pos_start, node.left_node.pos_end),
+      (node.right_node.pos_start, node.right_node.pos_end),
+      context
+    ))
 
   # Visit a Unary Operation Node, evaluate the operand, and perform the corresponding operation
   def visit_UnaryOpNode(self, node, context):
-    res = RTResult()
-    number = res.register(self.visit(node.node, context))
-    if res.should_return(): return res
+    value = self.visit(node.node, context)
+
+    if type(value) in RAW_NUMBER_TYPES:
+      if node.op_tok.type == TT_KWAI: return -value
+      if node.op_tok.matches(TT_KEYWORD, 'DILI'): return 1 if value == 0 else 0
+      return value
 
+    # The operand is shared, so a copy placed at its source span performs the operation
+    value = value.copy().set_pos(node.node.pos_start, node.node.pos_end).set_context(context)
     error = None
 
     # Determine the operation based on the operator token type
     if node.op_tok.type == TT_KWAI:
-      number, error = number.multed_by(Number(-1))
+      value, error = value.multed_by(Number(-1))
     elif node.op_tok.matches(TT_KEYWORD, 'DILI'):
-      number, error = number.notted()
+      value, error = value.notted()
 
     # Handle errors and return the result
-    if error:
-      return res.failure(error)
-    else:
-      return res.success(number.set_pos(node.pos_start, node.pos_end))
+    if error: raise ErrorSignal(error)
+    return unbox_value(value)
 
   # Visit an If Node, evaluate conditions and execute corresponding branches
   def visit_IfNode(self, node, context):
-    res = RTResult()
-
     # Evaluate the condition expression
     for condition, expr, should_return_null in node.cases:
-      condition_value = res.register(self.visit(condition, context))
-      if res.should_return(): return res
-
       # Check if the condition is true, execute the corresponding branch
-      if condition_value.is_true():
-        expr_value = res.register(self.visit(expr, context))
-        if res.should_return(): return res
-        return res.success(Number.null if should_return_null else expr_value)
+      if value_is_true(self.visit(condition, context)):
+        if should_return_null:
+          self.visit_discarded(expr, context)
+          return 0
+        return self.visit(expr, context)
 
     # Execute the else case if present
     if node.else_case:
       expr, should_return_null = node.else_case
-      expr_value = res.register(self.visit(expr, context))
-      if res.should_return(): return res
-      return res.success(Number.null if should_return_null else expr_value)
+      if should_return_null:
+        self.visit_discarded(expr, context)
+        return 0
+      return self.visit(expr, context)
 
-    return res.success(Number.null)
+    return 0
 
   # Visit a For Node, execute a loop with a specified range and step
   def visit_ForNode(self, node, context):
-    res = RTResult()
     elements = []
+    var_name = node.var_name_tok.value
+    body_node = node.body_node
+    symbol_table = context.symbol_table
 
     # Evaluate start, end, and step values
-    start_value = res.register(self.visit(node.start_value_node, context))
-    if res.should_return(): return res
-    end_value = res.register(self.visit(node.end_value_node, context))
-    if res.should_return(): return res
+    start_value = unbox_value(self.visit(node.start_value_node, context))
+    end_value = unbox_value(self.visit(node.end_value_node, context))
 
     # Evaluate step value or use default step value (1)
     if node.step_value_node:
-      step_value = res.register(self.visit(node.step_value_node, context))
-      if res.should_return(): return res
+      step_value = unbox_value(self.visit(node.step_value_node, context))
     else:
-      step_value = Number(1)
+      step_value = 1
 
-    i = start_value.value
+    i = start_value
+    ascending = step_value >= 0
 
-    # Define condition based on the step value
-    if step_value.value >= 0:
-      condition = lambda: i < end_value.value
-    else:
-      condition = lambda: i > end_value.value
-
-    # Loop through the specified range and execute the body
-    while condition():
-      context.symbol_table.set(node.var_name_tok.value, Number(i))
-      i += step_value.value
+    # Loop through the specified range and execute the body, HUNONG and UNAHAN arrive as signals
+    while i < end_value if ascending else i > end_value:
+      symbol_table.set(var_name, i)
+      i += step_value
 
-      value = res.register(self.visit(node.body_node, context))
-      if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
-
-      if res.loop_should_continue:
+      try:
+        if node.should_return_null:
+          self.visit_discarded(body_node, context)
+        else:
+          elements.append(box_value(self.visit(body_node, context)))
+      except ContinueSignal:
         continue
-
-      if res.loop_should_break:
+      except BreakSignal:
         break
 
-      elements.append(value)
-
     # Return the result, considering whether the loop should return null
-    return res.success(
-      Number.null if node.should_return_null else
-      List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-    )
+    return 0 if node.should_return_null else List(elements)
 
   # Visit a While Node, execute a loop while a condition is true
   def visit_WhileNode(self, node, context):
-    res = RTResult()
     elements = []
 
-    # Evaluate the condition
-    while True:
-      condition = res.register(self.visit(node.condition_node, context))
-      if res.should_return(): return res
-
-      # Break the loop if the condition is not true
-      if not condition.is_true():
-        break
-
-     # Execute the body of the loop
-      value = res.register(self.visit(node.body_node, context))
-      if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
-
-      if res.loop_should_continue:
+    # Evaluate the condition, breaking the loop once it is not true
+    while value_is_true(self.visit(node.condition_node, context)):
+      # Execute the body of the loop, HUNONG and UNAHAN arrive as signals
+      try:
+        if node.should_return_null:
+          self.visit_discarded(node.body_node, context)
+        else:
+          elements.append(box_value(self.visit(node.body_node, context)))
+      except ContinueSignal:
         continue
-
-      if res.loop_should_break:
+      except BreakSignal:
         break
 
-      elements.append(value)
-
     # Return the result, considering whether the loop should return null
-    return res.success(
-      Number.null if node.should_return_null else
-      List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-    )
+    return 0 if node.should_return_null else List(elements)
 
   # Visit a Function Definition Node, create a function value, and store it in the symbol table
   def visit_FuncDefNode(self, node, context):
-    res = RTResult()
-
     func_name = node.var_name_tok.value if node.var_name_tok else None
     body_node = node.body_node
     arg_names = [arg_name.value for arg_name in node.arg_name_toks]
-    func_value = Function(func_name, body_node, arg_names, node.should_auto_return).set_context(context).set_pos(node.pos_start, node.pos_end)
+    func_value = Function(func_name, body_node, arg_names, node.should_auto_return).set_context(context).set_namespace(context).set_pos(node.pos_start, node.pos_end)
 
     if node.var_name_tok:
       context.symbol_table.set(func_name, func_value)
 
-    return res.success(func_value)
+    return func_value
 
   # Visit a Function Call Node, execute the function with the provided arguments
   def visit_CallNode(self, node, context):
-    res = RTResult()
-    args = []
+    # Evaluate the value to call and the arguments
+    value_to_call = self.visit(node.node_to_call, context)
+    args = [self.visit(arg_node, context) for arg_node in node.arg_nodes]
+
+    # Interpreted functions are called in place with the call site, take raw numbers and raise their signals directly
+    if isinstance(value_to_call, Function):
+      # A tail call with the right number of arguments is handed to the call running this function, dropping its frame
+      if node.tail and len(args) == len(value_to_call.arg_names) and can_drop_frame(context.symbol_table):
+        raise TailCallSignal(value_to_call, args, context, node.pos_start, node.pos_end)
+      return value_to_call.call(args, context, node.pos_start, node.pos_end)
+
+    # Anything else executes as a copy placed at the call site, which is where its errors point
+    value_to_call = box_value(value_to_call).copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+    return unbox_value(unwrap_result(value_to_call.execute([box_value(arg) for arg in args])))
+
+  # Visit a Member Access Node and return the member of the accessed value, as a raw number when it is one
+  def visit_MemberAccessNode(self, node, context):
+    value = self.visit(node.node, context)
+    return unbox_value(member_of(value, node.member_name_tok.value, (node.pos_start, node.pos_end), context))
+
+  # Visit a Return Node, evaluate the returned value, and raise it to the enclosing function
+  def visit_ReturnNode(self, node, context):
+    if node.node_to_return:
+      value = self.visit(node.node_to_return, context)
+    else:
+      value = 0
 
-    # Evaluate the value to call
-    value_to_call = res.register(self.visit(node.node_to_call, context))
-    if res.should_return(): return res
-    value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end)
+    raise ReturnSignal(value)
+
+  # Visit a Continue Node and raise a continue signal to the enclosing loop
+  def visit_ContinueNode(self, node, context):
+    raise ContinueSignal()
+
+  # Visit a BreakNode and raise a break signal to the enclosing loop
+  def visit_BreakNode(self, node, context):
+    raise BreakSignal()
+
+# Node type -> visit method, filled in the first time each node type is visited
+Interpreter.dispatch = DispatchTable(Interpreter, lambda node_type: f'visit_{node_type.__name__}', Interpreter.no_visit_method)
+
+#------------------------------#
+# BYTECODE
+#------------------------------#
+
+# Opcodes of the stack VM, every instruction is an opcode followed by one integer operand
+OP_LOAD_NAME        = 0
+OP_LOAD_CONST       = 1
+OP_STORE_NAME       = 2
+OP_POP_TOP          = 3
+OP_CALL             = 4
+OP_ADD              = 5
+OP_SUB              = 6
+OP_MUL              = 7
+OP_DIV              = 8
+OP_POW              = 9
+OP_EE               = 10
+OP_NE               = 11
+OP_LT               = 12
+OP_GT               = 13
+OP_LTE              = 14
+OP_GTE              = 15
+OP_AND              = 16
+OP_OR               = 17
+OP_NEG              = 18
+OP_NOT              = 19
+OP_JUMP             = 20
+OP_POP_JUMP_IF_FALSE = 21
+OP_FOR_PREP         = 22
+OP_FOR_ITER         = 23
+OP_NEW_RESULTS      = 24
+OP_APPEND_RESULT    = 25
+OP_MAKE_RESULTS     = 26
+OP_BUILD_LIST       = 27
+OP_MAKE_FUNCTION    = 28
+OP_UNWIND           = 29
+OP_RETURN_VALUE     = 30
+OP_BREAK_FRAME      = 31
+OP_CONTINUE_FRAME   = 32
+OP_END              = 33
+OP_LOAD_FAST        = 34
+OP_STORE_FAST       = 35
+OP_LOAD_GLOBAL      = 36
+OP_LOAD_MEMBER      = 37
+OP_TAIL_CALL        = 38
+OP_BUILD_MAP        = 39
+OP_BUILD_SET        = 40
+
+# Binary operator tokens mapped to their opcode and the Value method used on the slow path
+BINARY_OPCODES = {
+  TT_DUGANG: (OP_ADD, 'added_to'),
+  TT_KWAI: (OP_SUB, 'subbed_by'),
+  TT_DAGHANON: (OP_MUL, 'multed_by'),
+  TT_BAHIN: (OP_DIV, 'dived_by'),
+  TT_KAPILAON: (OP_POW, 'powed_by'),
+  TT_EE: (OP_EE, 'get_comparison_eq'),
+  TT_NE: (OP_NE, 'get_comparison_ne'),
+  TT_LT: (OP_LT, 'get_comparison_lt'),
+  TT_GT: (OP_GT, 'get_comparison_gt'),
+  TT_LTE: (OP_LTE, 'get_comparison_lte'),
+  TT_GTE: (OP_GTE, 'get_comparison_gte'),
+  (TT_KEYWORD, 'UG'): (OP_AND, 'anded_by'),
+  (TT_KEYWORD, 'KUN'): (OP_OR, 'ored_by'),
+}
+
+# Opcode to Value method name, used when an operand is not a plain Number
+BINARY_METHODS = {opcode: method_name for opcode, method_name in BINARY_OPCODES.values()}
+
+# A compiled program or function body
+class CodeObject:
+  def __init__(self, name, scope=None):
+    self.name = name
+    self.scope = scope    # Local names stored in frame slots, None for the program itself
+    self.code = []        # Flat list of opcode, operand pairs
+    self.nodes = []       # Source node of each instruction, only read when reporting errors
+    self.consts = []      # Constant values and function templates
+    self.names = []       # Variable names referenced by LOAD_NAME / STORE_NAME / LOAD_GLOBAL
+    self.call_loops = {}  # Call instruction index -> loop record of its enclosing loop
+
+#------------------------------#
+# COMPILER
+#------------------------------#
 
-    # Evaluate the arguments
+class Compiler:
+  # Compile a node into a new code object, with the scope of the function whose body it is
+  def compile(self, node, name='<program>', scope=None):
+    self.code = CodeObject(name, scope)
+    self.scope = scope
+    self.depth = 0    # Static stack depth at the current instruction
+    self.loops = []   # Enclosing loop records as [continue target, stack depth, break target, break jumps]
+    self.visit(node)
+    self.emit(OP_END, 0, node)
+    return self.code
+
+  # Compile a specific node based on its type
+  def visit(self, node):
+    method_name = f'compile_{type(node).__name__}'
+    method = getattr(self, method_name, self.no_compile_method)
+    return method(node)
+
+  # Error handling for undefined compile methods
+  def no_compile_method(self, node):
+    raise Exception(f'No compile_{type(node).__name__} method defined')
+
+  ###################################
+
+  # Append an instruction and return its index
+  def emit(self, op, arg, node, stack_effect=0):
+    index = len(self.code.code)
+    self.code.code.extend((op, arg))
+    self.code.nodes.append(node)
+    self.depth += stack_effect
+    return index
+
+  # Index of the next instruction to be emitted
+  def label(self):
+    return len(self.code.code)
+
+  # Point the operand of a previously emitted jump to a target
+  def patch(self, index, target):
+    self.code.code[index + 1] = target
+
+  # Add a constant and return its index
+  def const(self, value):
+    self.code.consts.append(value)
+    return len(self.code.consts) - 1
+
+  # Return the index of a variable name, adding it if new
+  def name(self, name):
+    if name not in self.code.names:
+      self.code.names.append(name)
+    return self.code.names.index(name)
+
+  # Emit the null value used by statements that do not produce one
+  def emit_null(self, node):
+    self.emit(OP_LOAD_CONST, self.const(Number.null), node, 1)
+
+  ###################################
+
+  def compile_NumberNode(self, node):
+    self.emit(OP_LOAD_CONST, self.const(Number(node.tok.value)), node, 1)
+
+  def compile_StringNode(self, node):
+    self.emit(OP_LOAD_CONST, self.const(String(node.tok.value)), node, 1)
+
+  def compile_ListNode(self, node):
+    for element_node in node.element_nodes:
+      self.visit(element_node)
+    self.emit(OP_BUILD_LIST, len(node.element_nodes), node, 1 - len(node.element_nodes))
+
+  def compile_MapNode(self, node):
+    for key_node, value_node in zip(node.key_nodes, node.value_nodes):
+      self.visit(key_node)
+      self.visit(value_node)
+    self.emit(OP_BUILD_MAP, len(node.key_nodes), node, 1 - 2 * len(node.key_nodes))
+
+  def compile_SetNode(self, node):
+    for element_node in node.element_nodes:
+      self.visit(element_node)
+    self.emit(OP_BUILD_SET, len(node.element_nodes), node, 1 - len(node.element_nodes))
+
+  def compile_VarAccessNode(self, node):
+    if node.slot is not None:
+      self.emit(OP_LOAD_FAST, node.slot, node, 1)
+    elif self.scope:
+      self.emit(OP_LOAD_GLOBAL, self.name(node.var_name_tok.value), node, 1)
+    else:
+      self.emit(OP_LOAD_NAME, self.name(node.var_name_tok.value), node, 1)
+
+  def compile_VarAssignNode(self, node):
+    self.visit(node.value_node)
+    self.emit_store(node.var_name_tok.value, node.slot, node)
+
+  # Store the value on top of the stack in a frame slot or by name, leaving it on the stack
+  def emit_store(self, var_name, slot, node):
+    if slot is not None:
+      self.emit(OP_STORE_FAST, slot, node)
+    else:
+      self.emit(OP_STORE_NAME, self.name(var_name), node)
+
+  def compile_BinOpNode(self, node):
+    self.visit(node.left_node)
+    self.visit(node.right_node)
+    opcode, _ = BINARY_OPCODES[node.op_key]
+    self.emit(opcode, 0, node, -1)
+
+  def compile_UnaryOpNode(self, node):
+    self.visit(node.node)
+    if node.op_tok.type == TT_KWAI:
+      self.emit(OP_NEG, 0, node)
+    elif node.op_tok.matches(TT_KEYWORD, 'DILI'):
+      self.emit(OP_NOT, 0, node)
+
+  def compile_IfNode(self, node):
+    end_jumps = []
+    base_depth = self.depth
+
+    for condition, expr, should_return_null in node.cases:
+      self.visit(condition)
+      next_case = self.emit(OP_POP_JUMP_IF_FALSE, 0, node, -1)
+      self.compile_branch(expr, should_return_null)
+      end_jumps.append(self.emit(OP_JUMP, 0, node))
+      self.depth = base_depth
+      self.patch(next_case, self.label())
+
+    if node.else_case:
+      expr, should_return_null = node.else_case
+      self.compile_branch(expr, should_return_null)
+    else:
+      self.emit_null(node)
+
+    for index in end_jumps:
+      self.patch(index, self.label())
+
+  # Compile the body of an if case, replacing its value with null for block cases
+  def compile_branch(self, expr, should_return_null):
+    self.visit(expr)
+    if should_return_null:
+      self.emit(OP_POP_TOP, 0, expr, -1)
+      self.emit_null(expr)
+
+  def compile_ForNode(self, node):
+    if not node.should_return_null:
+      self.emit(OP_NEW_RESULTS, 0, node, 1)
+    results_depth = self.depth - 1
+
+    self.visit(node.start_value_node)
+    self.visit(node.end_value_node)
+    if node.step_value_node:
+      self.visit(node.step_value_node)
+    else:
+      self.emit(OP_LOAD_CONST, self.const(Number(1)), node, 1)
+    self.emit(OP_FOR_PREP, 0, node, -2)
+
+    # The loop state sits on top of the stack while the body runs
+    loop_start = self.label()
+    loop_exit = self.emit(OP_FOR_ITER, 0, node, 1)
+    self.emit_store(node.var_name_tok.value, node.slot, node)
+    self.emit(OP_POP_TOP, 0, node, -1)
+    self.compile_loop_body(node, loop_start, results_depth)
+
+    # Break jumps land here with the loop state still on the stack
+    self.emit(OP_JUMP, loop_start, node)
+    self.patch_breaks(self.label())
+    self.emit(OP_POP_TOP, 0, node, -1)
+    self.patch(loop_exit, self.label())
+    self.finish_loop(node)
+
+  def compile_WhileNode(self, node):
+    if not node.should_return_null:
+      self.emit(OP_NEW_RESULTS, 0, node, 1)
+    results_depth = self.depth - 1
+
+    loop_start = self.label()
+    self.visit(node.condition_node)
+    loop_exit = self.emit(OP_POP_JUMP_IF_FALSE, 0, node, -1)
+    self.compile_loop_body(node, loop_start, results_depth)
+
+    self.emit(OP_JUMP, loop_start, node)
+    self.patch_breaks(self.label())
+    self.patch(loop_exit, self.label())
+    self.finish_loop(node)
+
+  # Compile a loop body, collecting its value unless the loop returns null
+  def compile_loop_body(self, node, loop_start, results_depth):
+    self.loops.append([loop_start, self.depth, None, []])
+    self.visit(node.body_node)
+    if node.should_return_null:
+      self.emit(OP_POP_TOP, 0, node, -1)
+    else:
+      self.emit(OP_APPEND_RESULT, results_depth, node, -1)
+
+  # Point all break jumps of the innermost loop to a target
+  def patch_breaks(self, target):
+    loop = self.loops.pop()
+    loop[2] = target
+    for index in loop[3]:
+      self.patch(index, target)
+
+  # Push the loop value, a list of body values or null
+  def finish_loop(self, node):
+    if node.should_return_null:
+      self.emit_null(node)
+    else:
+      self.emit(OP_MAKE_RESULTS, 0, node)
+
+  def compile_FuncDefNode(self, node):
+    func_name = node.var_name_tok.value if node.var_name_tok else None
+    arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+    body_code = Compiler().compile(node.body_node, func_name or '<anonymous>', node.scope)
+    template = (func_name, body_code, arg_names, node.should_auto_return)
+    self.emit(OP_MAKE_FUNCTION, self.const(template), node, 1)
+
+    if node.var_name_tok:
+      self.emit_store(func_name, node.slot, node)
+
+  def compile_CallNode(self, node):
+    self.visit(node.node_to_call)
     for arg_node in node.arg_nodes:
-      args.append(res.register(self.visit(arg_node, context)))
-      if res.should_return(): return res
+      self.visit(arg_node)
+    index = self.emit(OP_TAIL_CALL if node.tail else OP_CALL, len(node.arg_nodes), node, -len(node.arg_nodes))
 
-    # Execute the function with the arguments
-    return_value = res.register(value_to_call.execute(args))
-    if res.should_return(): return res
-    return_value = return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
-    return res.success(return_value)
+    # Loop signals escaping the callee continue or break the loop around the call
+    if self.loops:
+      self.code.call_loops[index] = self.loops[-1]
 
-  # Visit a Return Node, evaluate the returned value, and return a success result with the value
-  def visit_ReturnNode(self, node, context):
-    res = RTResult()
+  def compile_MemberAccessNode(self, node):
+    self.visit(node.node)
+    self.emit(OP_LOAD_MEMBER, self.name(node.member_name_tok.value), node)
 
+  def compile_ReturnNode(self, node):
     if node.node_to_return:
-      value = res.register(self.visit(node.node_to_return, context))
+      self.visit(node.node_to_return)
+    else:
+      self.emit_null(node)
+    self.emit(OP_RETURN_VALUE, 0, node)
+
+  def compile_ContinueNode(self, node):
+    if not self.loops:
+      self.emit(OP_CONTINUE_FRAME, 0, node)
+    else:
+      loop_start, depth, _, _ = self.loops[-1]
+      self.emit(OP_UNWIND, depth, node)
+      self.emit(OP_JUMP, loop_start, node)
+    self.depth += 1
+
+  def compile_BreakNode(self, node):
+    if not self.loops:
+      self.emit(OP_BREAK_FRAME, 0, node)
+    else:
+      _, depth, _, break_jumps = self.loops[-1]
+      self.emit(OP_UNWIND, depth, node)
+      break_jumps.append(self.emit(OP_JUMP, 0, node))
+    self.depth += 1
+
+#------------------------------#
+# VIRTUAL MACHINE
+#------------------------------#
+
+# Function class representing user-defined functions compiled to bytecode
+class CompiledFunction(BaseFunction):
+  # Initialize the CompiledFunction object with a name, code object, argument names, and auto-return flag
+  def __init__(self, name, code, arg_names, should_auto_return):
+    super().__init__(name)
+    self.code = code
+    self.arg_names = arg_names
+    self.should_auto_return = should_auto_return
+
+  # Store resolved locals in a frame
+  def new_symbol_table(self, parent):
+    if self.code.scope: return Frame(self.code.scope, parent)
+    return SymbolTable(parent)
+
+  # Execute the function's code object with the given arguments
+  def execute(self, args):
+    res = RTResult()
+    exec_ctx = self.generate_new_context()
+
+    res.register(self.check_and_populate_args(self.arg_names, args, exec_ctx))
+    if res.should_return(): return res
+
+    value = res.register(VM().run(self.code, exec_ctx))
+    if res.should_return() and res.func_return_value == None: return res
+
+    ret_value = (value if self.should_auto_return else None) or res.func_return_value or Number.null
+    return res.success(ret_value)
+
+  # Create a copy of the current CompiledFunction
+  def copy(self):
+    copy = CompiledFunction(self.name, self.code, self.arg_names, self.should_auto_return)
+    copy.set_context(self.context)
+    copy.set_pos(self.pos_start, self.pos_end)
+    copy.namespace = self.namespace
+    return copy
+
+  # Representation of the CompiledFunction object
+  def __repr__(self):
+    return f"<function {self.name}>"
+
+class VM:
+  # Execute a code object in the given context and return its runtime result
+  # Calls between compiled functions keep their frames on a list instead of the Python stack, so recursion is bounded by memory alone
+  def run(self, code, context):
+    frames = []                 # Saved frames of the callers as (code, pc, stack, context, should_auto_return)
+    should_auto_return = None   # Whether the running function returns the value of its body, None for the code run was given
+    stack = []
+    pc = 0
+
+    # Switch to the current frame, the dispatch loop breaks out of itself after a call or a return changes it
+    while True:
+      ops = code.code
+      consts = code.consts
+      names = code.names
+      symbol_table = context.symbol_table
+      values = symbol_table.values if code.scope else None
+      push = stack.append
+      pop = stack.pop
+
+      while True:
+        op = ops[pc]
+        arg = ops[pc + 1]
+        pc += 2
+
+        if op == OP_LOAD_FAST:
+          value = values[arg]
+          if value is None:
+            # A local read before its first assignment is looked up in the calling frames
+            value = symbol_table.get(code.scope.names[arg])
+            if value is None:
+              node = code.nodes[(pc >> 1) - 1]
+              return RTResult().failure(RTError(
+                node.pos_start, node.pos_end,
+                f"'{code.scope.names[arg]}' is not defined",
+                context
+              ))
+          push(value)
+
+        elif op == OP_STORE_FAST:
+          values[arg] = stack[-1]
+
+        elif op == OP_LOAD_GLOBAL:
+          value = symbol_table.get_global(names[arg])
+          if value is None:
+            node = code.nodes[(pc >> 1) - 1]
+            return RTResult().failure(RTError(
+              node.pos_start, node.pos_end,
+              f"'{names[arg]}' is not defined",
+              context
+            ))
+          push(value)
+
+        elif op == OP_LOAD_NAME:
+          value = symbol_table.get(names[arg])
+          if value is None:
+            node = code.nodes[(pc >> 1) - 1]
+            return RTResult().failure(RTError(
+              node.pos_start, node.pos_end,
+              f"'{names[arg]}' is not defined",
+              context
+            ))
+          push(value)
+
+        elif op == OP_LOAD_CONST:
+          push(consts[arg])
+
+        elif op == OP_STORE_NAME:
+          symbol_table.set(names[arg], stack[-1])
+
+        elif op == OP_POP_TOP:
+          pop()
+
+        elif op <= OP_OR and op >= OP_ADD:
+          right = pop()
+          left = stack[-1]
+          if left.__class__ is Number and right.__class__ is Number:
+            a = left.value
+            b = right.value
+            if op == OP_ADD: stack[-1] = Number(a + b)
+            elif op == OP_SUB: stack[-1] = Number(a - b)
+            elif op == OP_LT: stack[-1] = Number.true if a < b else Number.false
+            elif op == OP_MUL: stack[-1] = Number(a * b)
+            elif op == OP_EE: stack[-1] = Number.true if a == b else Number.false
+            elif op == OP_DIV:
+              if b == 0:
+                node = code.nodes[(pc >> 1) - 1].right_node
+                return RTResult().failure(RTError(
+                  node.pos_start, node.pos_end,
+                  'Division by zero',
+                  context
+                ))
+              stack[-1] = Number(a / b)
+            elif op == OP_GT: stack[-1] = Number.true if a > b else Number.false
+            elif op == OP_NE: stack[-1] = Number.true if a != b else Number.false
+            elif op == OP_LTE: stack[-1] = Number.true if a <= b else Number.false
+            elif op == OP_GTE: stack[-1] = Number.true if a >= b else Number.false
+            elif op == OP_POW: stack[-1] = Number(a ** b)
+            elif op == OP_AND: stack[-1] = Number(int(a and b))
+            else: stack[-1] = Number(int(a or b))
+          else:
+            # The operands may be shared, so a failing operation is repeated on copies placed at their spans
+            result, error = getattr(left, BINARY_METHODS[op])(right)
+            if error:
+              node = code.nodes[(pc >> 1) - 1]
+              return catch_signals(
+                slow_binary_op, BINARY_METHODS[op], left.copy(), right.copy(),
+                (node.left_node.pos_start, node.left_node.pos_end), (node.right_node.pos_start, node.right_node.pos_end), context
+              )
+            stack[-1] = result
+
+        elif op == OP_POP_JUMP_IF_FALSE:
+          value = pop()
+          if not (value.value != 0 if value.__class__ is Number else value.is_true()):
+            pc = arg
+
+        elif op == OP_JUMP:
+          pc = arg
+
+        elif op == OP_FOR_ITER:
+          state = stack[-1]
+          i = state[0]
+          if (i < state[1]) if state[2] >= 0 else (i > state[1]):
+            state[0] = i + state[2]
+            push(Number(i))
+          else:
+            pop()
+            pc = arg
+
+        elif op == OP_CALL or op == OP_TAIL_CALL:
+          args = stack[len(stack) - arg:]
+          del stack[len(stack) - arg:]
+          node = code.nodes[(pc >> 1) - 1]
+          value_to_call = pop()
+
+          # A compiled function is entered in this loop, with the caller's frame saved on the frame stack
+          # It gets the context, symbol table and arguments CompiledFunction.execute would give it
+          if value_to_call.__class__ is CompiledFunction:
+            arg_names = value_to_call.arg_names
+            if len(args) != len(arg_names):
+              return value_to_call.copy().set_pos(node.pos_start, node.pos_end).set_context(context).check_args(arg_names, args)
+
+            # A tail call from a function entered in this loop replaces it, as if made from the same caller and call site
+            if op == OP_TAIL_CALL and frames and can_drop_frame(symbol_table):
+              context = Context(value_to_call.name, context.parent, context.parent_entry_pos)
+              context.symbol_table = value_to_call.new_symbol_table(value_to_call.outer_table(context.parent.symbol_table))
+            else:
+              frames.append((code, pc, stack, context, should_auto_return))
+              context = Context(value_to_call.name, context, node.pos_start)
+              context.symbol_table = value_to_call.new_symbol_table(value_to_call.outer_table(symbol_table))
+            for arg_name, arg_value in zip(arg_names, args):
+              arg_value.set_context(context)
+              context.symbol_table.set(arg_name, arg_value)
+
+            code = value_to_call.code
+            should_auto_return = value_to_call.should_auto_return
+            stack = []
+            pc = 0
+            break
+
+          value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+          res = value_to_call.execute(args)
+
+          if res.should_return():
+            if res.error: return res
+            loop = code.call_loops.get(pc - 2)
+            if loop is None:
+              # The loop signal leaves this frame as if it ran HUNONG or UNAHAN itself
+              frame = self.unwind_loop_signal(frames)
+              if frame is None: return res
+              code, pc, stack, context, should_auto_return = frame
+              loop = code.call_loops[pc - 2]
+            loop_start, depth, break_target, _ = loop
+            del stack[depth:]
+            pc = loop_start if res.loop_should_continue else break_target
+            break
+
+          push(res.value)
+
+        elif op == OP_APPEND_RESULT:
+          stack[arg].append(pop())
+
+        elif op == OP_NEW_RESULTS:
+          push([])
+
+        elif op == OP_MAKE_RESULTS:
+          node = code.nodes[(pc >> 1) - 1]
+          stack[-1] = List(stack[-1]).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+        elif op == OP_FOR_PREP:
+          step_value = pop()
+          end_value = pop()
+          start_value = stack[-1]
+          stack[-1] = [start_value.value, end_value.value, step_value.value]
+
+        elif op == OP_BUILD_LIST:
+          node = code.nodes[(pc >> 1) - 1]
+          if arg:
+            elements = stack[len(stack) - arg:]
+            del stack[len(stack) - arg:]
+          else:
+            elements = []
+          push(List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+        # Keys and values are on the stack in pairs, a key that cannot be hashed fails at its span
+        elif op == OP_BUILD_MAP or op == OP_BUILD_SET:
+          count = 2 * arg if op == OP_BUILD_MAP else arg
+          items = stack[len(stack) - count:]
+          del stack[len(stack) - count:]
+          node = code.nodes[(pc >> 1) - 1]
+          if op == OP_BUILD_MAP:
+            value, index = make_map(items[0::2], items[1::2])
+            item_nodes = node.key_nodes
+          else:
+            value, index = make_set(items)
+            item_nodes = node.element_nodes
+          if value is None:
+            item_node = item_nodes[index]
+            return RTResult().failure(unhashable_error(item_node.pos_start, item_node.pos_end, context))
+          push(value.set_context(context).set_pos(node.pos_start, node.pos_end))
+
+        elif op == OP_NEG or op == OP_NOT:
+          value = stack[-1]
+          if value.__class__ is Number:
+            if op == OP_NEG:
+              stack[-1] = Number(-value.value)
+            else:
+              stack[-1] = Number.true if value.value == 0 else Number.false
+            continue
+
+          node = code.nodes[(pc >> 1) - 1]
+          value.set_pos(node.node.pos_start, node.node.pos_end).set_context(context)
+          if op == OP_NEG:
+            result, error = value.multed_by(Number(-1))
+          else:
+            result, error = value.notted()
+          if error: return RTResult().failure(error)
+          stack[-1] = result
+
+        elif op == OP_MAKE_FUNCTION:
+          node = code.nodes[(pc >> 1) - 1]
+          push(CompiledFunction(*consts[arg]).set_context(context).set_namespace(context).set_pos(node.pos_start, node.pos_end))
+
+        elif op == OP_LOAD_MEMBER:
+          value = stack[-1]
+          member, error = value.get_member(names[arg])
+          if error:
+            node = code.nodes[(pc >> 1) - 1]
+            value.set_pos(node.pos_start, node.pos_end).set_context(context)
+            return RTResult().failure(value.get_member(names[arg])[1])
+          stack[-1] = box_value(member)
+
+        elif op == OP_UNWIND:
+          del stack[arg:]
+
+        elif op == OP_RETURN_VALUE or op == OP_END:
+          value = pop()
+          if not frames:
+            return RTResult().success_return(value) if op == OP_RETURN_VALUE else RTResult().success(value)
+
+          # A compiled function returns to its caller, only a BALIK gives a call without auto return its value
+          if op == OP_END and not should_auto_return: value = Number.null
+          code, pc, stack, context, should_auto_return = frames.pop()
+          stack.append(value)
+          break
+
+        elif op == OP_BREAK_FRAME or op == OP_CONTINUE_FRAME:
+          # The first caller whose call sits in a loop breaks or continues it, past the callers without one
+          frame = self.unwind_loop_signal(frames)
+          if frame is None:
+            return RTResult().success_break() if op == OP_BREAK_FRAME else RTResult().success_continue()
+
+          code, pc, stack, context, should_auto_return = frame
+          loop_start, depth, break_target, _ = code.call_loops[pc - 2]
+          del stack[depth:]
+          pc = loop_start if op == OP_CONTINUE_FRAME else break_target
+          break
+
+        else:
+          raise Exception(f'Unknown opcode {op}')
+
+  # Pop the frames a loop signal leaves, returning the first one whose pending call sits in a loop or None when it leaves them all
+  @staticmethod
+  def unwind_loop_signal(frames):
+    while frames:
+      frame = frames.pop()
+      if frame[0].call_loops.get(frame[1] - 2) is not None: return frame
+    return None
+
+#------------------------------#
+# CLOSURE COMPILER
+#------------------------------#
+
+# Function class representing user-defined functions whose body is a compiled Python callable
+class ClosureFunction(BaseFunction):
+  # Initialize the ClosureFunction object with a name, body closure, argument names, auto-return flag and local scope
+  def __init__(self, name, body, arg_names, should_auto_return, scope=None):
+    super().__init__(name)
+    self.body = body
+    self.arg_names = arg_names
+    self.should_auto_return = should_auto_return
+    self.scope = scope
+
+  # Store resolved locals in a frame
+  def new_symbol_table(self, parent):
+    if self.scope: return Frame(self.scope, parent)
+    return SymbolTable(parent)
+
+  # Call the body closure with the given arguments
+  def execute(self, args):
+    function = self
+    while True:
+      res = RTResult()
+      exec_ctx = function.generate_new_context()
+
+      res.register(function.check_and_populate_args(function.arg_names, args, exec_ctx))
       if res.should_return(): return res
+
+      try:
+        value = res.register(ClosureCompiler().run(function.body, exec_ctx))
+      except TailCallSignal as signal:
+        # The tail call is made in place of this one, as if from the same caller and call site
+        function = signal.function.copy().set_pos(self.pos_start, self.pos_end).set_context(self.context)
+        args = signal.args
+        continue
+
+      if res.should_return() and res.func_return_value == None: return res
+
+      ret_value = (value if function.should_auto_return else None) or res.func_return_value or Number.null
+      return res.success(ret_value)
+
+  # Create a copy of the current ClosureFunction
+  def copy(self):
+    copy = ClosureFunction(self.name, self.body, self.arg_names, self.should_auto_return, self.scope)
+    copy.set_context(self.context)
+    copy.set_pos(self.pos_start, self.pos_end)
+    copy.namespace = self.namespace
+    return copy
+
+  # Representation of the ClosureFunction object
+  def __repr__(self):
+    return f"<function {self.name}>"
+
+# Numeric fast paths per binary operator token, applied when both operands are plain Numbers
+NUMBER_BINARY_OPS = {
+  TT_DUGANG: lambda a, b: Number(a + b),
+  TT_KWAI: lambda a, b: Number(a - b),
+  TT_DAGHANON: lambda a, b: Number(a * b),
+  TT_KAPILAON: lambda a, b: Number(a ** b),
+  TT_EE: lambda a, b: Number.true if a == b else Number.false,
+  TT_NE: lambda a, b: Number.true if a != b else Number.false,
+  TT_LT: lambda a, b: Number.true if a < b else Number.false,
+  TT_GT: lambda a, b: Number.true if a > b else Number.false,
+  TT_LTE: lambda a, b: Number.true if a <= b else Number.false,
+  TT_GTE: lambda a, b: Number.true if a >= b else Number.false,
+  (TT_KEYWORD, 'UG'): lambda a, b: Number(int(a and b)),
+  (TT_KEYWORD, 'KUN'): lambda a, b: Number(int(a or b)),
+}
+
+class ClosureCompiler:
+  def __init__(self):
+    self.scope = None # Scope of the function body being compiled
+
+  # Compile a node into a closure taking the execution context
+  def compile(self, node):
+    method_name = f'compile_{type(node).__name__}'
+    method = getattr(self, method_name, self.no_compile_method)
+    return method(node)
+
+  # Error handling for undefined compile methods
+  def no_compile_method(self, node):
+    raise Exception(f'No compile_{type(node).__name__} method defined')
+
+  # Call a compiled closure and turn the signal it ends with into a runtime result
+  def run(self, closure, context):
+    return catch_signals(closure, context)
+
+  ###################################
+
+  def compile_NumberNode(self, node):
+    value = Number(node.tok.value).set_pos(node.pos_start, node.pos_end)
+    return lambda context: value
+
+  def compile_StringNode(self, node):
+    value = String(node.tok.value).set_pos(node.pos_start, node.pos_end)
+    return lambda context: value
+
+  def compile_ListNode(self, node):
+    element_fns = [self.compile(element_node) for element_node in node.element_nodes]
+    pos_start, pos_end = node.pos_start, node.pos_end
+
+    def list_(context):
+      return List([fn(context) for fn in element_fns]).set_context(context).set_pos(pos_start, pos_end)
+    return list_
+
+  def compile_MapNode(self, node):
+    entry_fns = [(self.compile(key_node), self.compile(value_node)) for key_node, value_node in zip(node.key_nodes, node.value_nodes)]
+    key_nodes = node.key_nodes
+    pos_start, pos_end = node.pos_start, node.pos_end
+
+    def map_(context):
+      keys = []
+      values = []
+      for key_fn, value_fn in entry_fns:
+        keys.append(key_fn(context))
+        values.append(value_fn(context))
+
+      value, index = make_map(keys, values)
+      if value is None:
+        raise ErrorSignal(unhashable_error(key_nodes[index].pos_start, key_nodes[index].pos_end, context))
+      return value.set_context(context).set_pos(pos_start, pos_end)
+    return map_
+
+  def compile_SetNode(self, node):
+    element_fns = [self.compile(element_node) for element_node in node.element_nodes]
+    element_nodes = node.element_nodes
+    pos_start, pos_end = node.pos_start, node.pos_end
+
+    def set_(context):
+      value, index = make_set([fn(context) for fn in element_fns])
+      if value is None:
+        raise ErrorSignal(unhashable_error(element_nodes[index].pos_start, element_nodes[index].pos_end, context))
+      return value.set_context(context).set_pos(pos_start, pos_end)
+    return set_
+
+  def compile_VarAccessNode(self, node):
+    var_name = node.var_name_tok.value
+    slot = node.slot
+
+    def undefined(context):
+      return ErrorSignal(RTError(
+        node.pos_start, node.pos_end,
+        f"'{var_name}' is not defined",
+        context
+      ))
+
+    # Locals are read from their frame slot, falling back to the calling frames before the first assignment
+    if slot is not None:
+      def local_access(context):
+        value = context.symbol_table.values[slot]
+        if value is None:
+          value = context.symbol_table.get(var_name)
+          if value is None: raise undefined(context)
+        return value
+      return local_access
+
+    if self.scope:
+      def global_access(context):
+        value = context.symbol_table.get_global(var_name)
+        if value is None: raise undefined(context)
+        return value
+      return global_access
+
+    def var_access(context):
+      value = context.symbol_table.get(var_name)
+      if value is None: raise undefined(context)
+      return value
+    return var_access
+
+  def compile_VarAssignNode(self, node):
+    value_fn = self.compile(node.value_node)
+    store = self.compile_store(node.var_name_tok.value, node.slot)
+
+    def var_assign(context):
+      value = value_fn(context)
+      store(context, value)
+      return value
+    return var_assign
+
+  # Return a function storing a value in a frame slot or under its name in the current symbol table
+  def compile_store(self, var_name, slot):
+    if slot is not None:
+      def store_local(context, value):
+        context.symbol_table.values[slot] = value
+      return store_local
+
+    def store_name(context, value):
+      context.symbol_table.symbols[var_name] = value
+    return store_name
+
+  def compile_BinOpNode(self, node):
+    left_fn = self.compile(node.left_node)
+    right_fn = self.compile(node.right_node)
+    op_key = node.op_key
+    method_name = node.operator.method_name
+    left_span = (node.left_node.pos_start, node.left_node.pos_end)
+    right_span = (node.right_node.pos_start, node.right_node.pos_end)
+
+    # Division checks its divisor, so it gets its own closure
+    if op_key == TT_BAHIN:
+      def divide(context):
+        left = left_fn(context)
+        right = right_fn(context)
+        if left.__class__ is Number and right.__class__ is Number and right.value != 0:
+          return Number(left.value / right.value)
+        return shared_binary_op(method_name, left, right, left_span, right_span, context)
+      return divide
+
+    number_op = NUMBER_BINARY_OPS[op_key]
+
+    def binary_op(context):
+      left = left_fn(context)
+      right = right_fn(context)
+      if left.__class__ is Number and right.__class__ is Number:
+        return number_op(left.value, right.value)
+      return shared_binary_op(method_name, left, right, left_span, right_span, context)
+
+    # Addition and subtraction dominate loop bodies, so they skip the operator table call
+    if op_key == TT_DUGANG:
+      def binary_op(context):
+        left = left_fn(context)
+        right = right_fn(context)
+        if left.__class__ is Number and right.__class__ is Number:
+          return Number(left.value + right.value)
+        return shared_binary_op(method_name, left, right, left_span, right_span, context)
+    elif op_key == TT_KWAI:
+      def binary_op(context):
+        left = left_fn(context)
+        right = right_fn(context)
+        if left.__class__ is Number and right.__class__ is Number:
+          return Number(left.value - right.value)
+        return shared_binary_op(method_name, left, right, left_span, right_span, context)
+
+    return binary_op
+
+  def compile_UnaryOpNode(self, node):
+    operand_fn = self.compile(node.node)
+
+    def set_operand_pos(value, context):
+      value.set_pos(node.node.pos_start, node.node.pos_end).set_context(context)
+
+    if node.op_tok.type == TT_KWAI:
+      def negate(context):
+        value = operand_fn(context)
+        if value.__class__ is Number:
+          return Number(-value.value)
+        set_operand_pos(value, context)
+        result, error = value.multed_by(Number(-1))
+        if error: raise ErrorSignal(error)
+        return result
+      return negate
+
+    if node.op_tok.matches(TT_KEYWORD, 'DILI'):
+      def not_(context):
+        value = operand_fn(context)
+        if value.__class__ is Number:
+          return Number.true if value.value == 0 else Number.false
+        set_operand_pos(value, context)
+        result, error = value.notted()
+        if error: raise ErrorSignal(error)
+        return result
+      return not_
+
+    return operand_fn
+
+  def compile_IfNode(self, node):
+    cases = [(self.compile(condition), self.compile(expr), should_return_null) for condition, expr, should_return_null in node.cases]
+    else_case = None
+    if node.else_case:
+      expr, should_return_null = node.else_case
+      else_case = (self.compile(expr), should_return_null)
+
+    def if_(context):
+      for condition_fn, expr_fn, should_return_null in cases:
+        condition = condition_fn(context)
+        if condition.value != 0 if condition.__class__ is Number else condition.is_true():
+          value = expr_fn(context)
+          return Number.null if should_return_null else value
+
+      if else_case:
+        expr_fn, should_return_null = else_case
+        value = expr_fn(context)
+        return Number.null if should_return_null else value
+
+      return Number.null
+    return if_
+
+  def compile_ForNode(self, node):
+    store = self.compile_store(node.var_name_tok.value, node.slot)
+    start_fn = self.compile(node.start_value_node)
+    end_fn = self.compile(node.end_value_node)
+    step_fn = self.compile(node.step_value_node) if node.step_value_node else None
+    body_fn = self.compile(node.body_node)
+    should_return_null = node.should_return_null
+
+    def for_(context):
+      elements = []
+      i = start_fn(context).value
+      end = end_fn(context).value
+      step = step_fn(context).value if step_fn else 1
+
+      while i < end if step >= 0 else i > end:
+        store(context, Number(i))
+        i += step
+
+        try:
+          value = body_fn(context)
+        except ContinueSignal:
+          continue
+        except BreakSignal:
+          break
+
+        if not should_return_null:
+          elements.append(value)
+
+      return (
+        Number.null if should_return_null else
+        List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+      )
+    return for_
+
+  def compile_WhileNode(self, node):
+    condition_fn = self.compile(node.condition_node)
+    body_fn = self.compile(node.body_node)
+    should_return_null = node.should_return_null
+
+    def while_(context):
+      elements = []
+
+      while True:
+        condition = condition_fn(context)
+        if not (condition.value != 0 if condition.__class__ is Number else condition.is_true()):
+          break
+
+        try:
+          value = body_fn(context)
+        except ContinueSignal:
+          continue
+        except BreakSignal:
+          break
+
+        if not should_return_null:
+          elements.append(value)
+
+      return (
+        Number.null if should_return_null else
+        List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+      )
+    return while_
+
+  def compile_FuncDefNode(self, node):
+    func_name = node.var_name_tok.value if node.var_name_tok else None
+    arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+    should_auto_return = node.should_auto_return
+    scope = node.scope
+    store = self.compile_store(func_name, node.slot)
+
+    enclosing_scope = self.scope
+    self.scope = scope
+    body_fn = self.compile(node.body_node)
+    self.scope = enclosing_scope
+
+    def func_def(context):
+      func_value = ClosureFunction(func_name, body_fn, arg_names, should_auto_return, scope).set_context(context).set_namespace(context).set_pos(node.pos_start, node.pos_end)
+      if func_name:
+        store(context, func_value)
+      return func_value
+    return func_def
+
+  def compile_CallNode(self, node):
+    callee_fn = self.compile(node.node_to_call)
+    arg_fns = [self.compile(arg_node) for arg_node in node.arg_nodes]
+    pos_start, pos_end = node.pos_start, node.pos_end
+
+    def call(context):
+      value_to_call = callee_fn(context).copy().set_pos(pos_start, pos_end).set_context(context)
+      args = [fn(context) for fn in arg_fns]
+      return unwrap_result(value_to_call.execute(args))
+
+    if not node.tail: return call
+
+    # A tail call with the right number of arguments is handed to the call running this function, dropping its frame
+    def tail_call(context):
+      value_to_call = callee_fn(context)
+      args = [fn(context) for fn in arg_fns]
+      if value_to_call.__class__ is ClosureFunction and len(args) == len(value_to_call.arg_names) and can_drop_frame(context.symbol_table):
+        raise TailCallSignal(value_to_call, args, context, pos_start, pos_end)
+      return unwrap_result(value_to_call.copy().set_pos(pos_start, pos_end).set_context(context).execute(args))
+    return tail_call
+
+  def compile_MemberAccessNode(self, node):
+    value_fn = self.compile(node.node)
+    member_name = node.member_name_tok.value
+    span = (node.pos_start, node.pos_end)
+
+    def member_access(context):
+      return box_value(member_of(value_fn(context), member_name, span, context))
+    return member_access
+
+  def compile_ReturnNode(self, node):
+    value_fn = self.compile(node.node_to_return) if node.node_to_return else None
+
+    def return_(context):
+      raise ReturnSignal(value_fn(context) if value_fn else Number.null)
+    return return_
+
+  def compile_ContinueNode(self, node):
+    def continue_(context):
+      raise ContinueSignal()
+    return continue_
+
+  def compile_BreakNode(self, node):
+    def break_(context):
+      raise BreakSignal()
+    return break_
+
+#------------------------------#
+# PYTHON TRANSPILER
+#------------------------------#
+
+# Loop counter values of a transpiled PARA, a plain range() when every bound is an integer
+def python_range(start, end, step):
+  if start.__class__ is int and end.__class__ is int and step.__class__ is int and step != 0:
+    return range(start, end, step)
+  return float_range(start, end, step)
+
+# Loop counter values with the interpreter's semantics for float bounds and a zero step
+def float_range(start, end, step):
+  i = start
+  while i < end if step >= 0 else i > end:
+    yield i
+    i += step
+
+# Look up a variable through the symbol table chain, failing like visit_VarAccessNode
+def python_load_name(context, var_name, span):
+  value = context.symbol_table.get(var_name)
+  if value is None:
+    raise ErrorSignal(RTError(span[0], span[1], f"'{var_name}' is not defined", context))
+  return value
+
+# Look up a free name of a function, skipping the frames when none of them can bind it
+def python_load_global(context, var_name, span):
+  value = context.symbol_table.get_global(var_name)
+  if value is None:
+    raise ErrorSignal(RTError(span[0], span[1], f"'{var_name}' is not defined", context))
+  return value
+
+# Apply a unary Value method to a value that is not a plain Number
+def python_unary_op(method_name, value, span, context):
+  value.set_pos(*span).set_context(context)
+  if method_name == 'multed_by':
+    result, error = value.multed_by(Number(-1))
+  else:
+    result, error = value.notted()
+  if error: raise ErrorSignal(error)
+  return result
+
+# Call a value from transpiled code
+def python_call(value_to_call, args, span, context):
+  return unwrap_result(value_to_call.copy().set_pos(*span).set_context(context).execute(args))
+
+# Make a tail call from transpiled code, handing a function with the right number of arguments to the call running this one
+def python_tail_call(value_to_call, args, span, context):
+  if value_to_call.__class__ is ClosureFunction and len(args) == len(value_to_call.arg_names) and can_drop_frame(context.symbol_table):
+    raise TailCallSignal(value_to_call, args, context, *span)
+  return python_call(value_to_call, args, span, context)
+
+# Get a member of a value from transpiled code
+def python_load_member(value, member_name, span, context):
+  return box_value(member_of(value, member_name, span, context))
+
+# Create the function value of a transpiled ROTA; the Python function returns the BisCom return value itself
+def python_make_function(name, body, arg_names, scope, context, span):
+  return ClosureFunction(name, body, arg_names, True, scope).set_context(context).set_namespace(context).set_pos(*span)
+
+# Create a List value from transpiled code
+def python_make_list(elements, context, span):
+  return List(elements).set_context(context).set_pos(*span)
+
+# Make a Map in transpiled code, failing at the span of a key that cannot be hashed
+def python_make_map(keys, values, key_spans, context, span):
+  value, index = make_map(keys, values)
+  if value is None: raise ErrorSignal(unhashable_error(*key_spans[index], context))
+  return value.set_context(context).set_pos(*span)
+
+# Make a Set in transpiled code, failing at the span of an element that cannot be hashed
+def python_make_set(elements, element_spans, context, span):
+  value, index = make_set(elements)
+  if value is None: raise ErrorSignal(unhashable_error(*element_spans[index], context))
+  return value.set_context(context).set_pos(*span)
+
+# Rebuild the position table of a standalone transpiled module from (idx, after) pairs
+def load_positions(fn, text, table):
+  source = Source(fn, text)
+  return [
+    tuple((NextPosition if after else Position)(idx, source) for idx, after in span)
+    for span in table
+  ]
+
+# Names available to transpiled code
+PYTHON_RUNTIME = {
+  '_Number': Number,
+  '_String': String,
+  '_null': Number.null,
+  '_true': Number.true,
+  '_false': Number.false,
+  '_range': python_range,
+  '_load': python_load_name,
+  '_global': python_load_global,
+  '_Scope': Scope,
+  '_binop': shared_binary_op,
+  '_unary': python_unary_op,
+  '_call': python_call,
+  '_tail_call': python_tail_call,
+  '_member': python_load_member,
+  '_function': python_make_function,
+  '_List': python_make_list,
+  '_Map': python_make_map,
+  '_Set': python_make_set,
+  '_ReturnSignal': ReturnSignal,
+  '_BreakSignal': BreakSignal,
+  '_ContinueSignal': ContinueSignal,
+}
+
+# Python expressions for binary operators on two plain Numbers, '{0}' and '{1}' being the operand values
+PYTHON_NUMBER_OPS = {
+  OP_ADD: '_Number({0} + {1})',
+  OP_SUB: '_Number({0} - {1})',
+  OP_MUL: '_Number({0} * {1})',
+  OP_DIV: '_Number({0} / {1})',
+  OP_POW: '_Number({0} ** {1})',
+  OP_EE: '(_true if {0} == {1} else _false)',
+  OP_NE: '(_true if {0} != {1} else _false)',
+  OP_LT: '(_true if {0} < {1} else _false)',
+  OP_GT: '(_true if {0} > {1} else _false)',
+  OP_LTE: '(_true if {0} <= {1} else _false)',
+  OP_GTE: '(_true if {0} >= {1} else _false)',
+  OP_AND: '_Number(int({0} and {1}))',
+  OP_OR: '_Number(int({0} or {1}))',
+}
+
+# Check whether a node calls anything outside of nested function definitions
+def contains_call(node):
+  if isinstance(node, CallNode): return True
+  if isinstance(node, FuncDefNode): return False
+  return any(contains_call(child) for child in iter_child_nodes(node))
+
+# A transpiled program, compiled by Python and ready to run
+class PythonProgram:
+  def __init__(self, fn, text, source, positions, line_map, names):
+    self.fn = fn
+    self.text = text
+    self.source = source
+    self.positions = positions    # (pos_start, pos_end) spans referenced as _P[k] by the source
+    self.line_map = line_map      # Generated line number -> BisCom position of the statement it came from
+    self.names = names            # ResolvedNames of the functions of the program
+    self.filename = f'<biscom {fn}>'
+    self.code = compile(source, self.filename, 'exec')
+
+  # Run the program in a context and return its runtime result
+  def run(self, context):
+    context.symbol_table.names.update(self.names)
+    namespace = dict(PYTHON_RUNTIME)
+    namespace['_P'] = self.positions
+    exec(self.code, namespace)
+
+    try:
+      return ClosureCompiler().run(namespace['_program'], context)
+    except RecursionError as e:
+      # Point at the deepest BisCom line that was running when Python ran out of stack
+      pos = self.position_of(e.__traceback__)
+      return RTResult().failure(RTError(pos, pos.copy().advance(), 'Maximum recursion depth exceeded', context))
+
+  # Map the innermost generated frame of a traceback back to a BisCom position
+  def position_of(self, tb):
+    pos = self.line_map[min(self.line_map)]
+    while tb:
+      if tb.tb_frame.f_code.co_filename == self.filename:
+        pos = self.line_map.get(tb.tb_lineno, pos)
+      tb = tb.tb_next
+    return pos
+
+  # Python module equivalent to the program, which imports BisCom and so runs only where BisCom.py is on sys.path
+  def module_source(self):
+    table = [
+      ((start.idx, start.after), (end.idx, end.after))
+      for start, end in self.positions
+    ]
+    return (
+      f'# Generated by BisCom from {self.fn}\n'
+      '# Needs BisCom.py on sys.path, for example in the same directory as this file\n'
+      'import BisCom\n'
+      'globals().update(BisCom.PYTHON_RUNTIME)\n'
+      f'_P = BisCom.load_positions({self.fn!r}, {self.text!r}, {table!r})\n\n'
+      + self.source +
+      "\nif __name__ == '__main__':\n"
+      f'  _, error = BisCom.run_callable(_program, {sorted(self.names.bound)!r}, {sorted(self.names.free)!r})\n'
+      '  if error: print(error.as_string())\n'
+    )
+
+class PythonTranspiler:
+  # Translate a program node, whose functions bind and read the given ResolvedNames, into Python source
+  def transpile(self, fn, text, node, names):
+    self.positions = []
+    self.const_lines = []
+    self.number_consts = {}   # Constant name -> raw value, for Number literals
+    self.functions = []
+    self.function_count = 0
+    self.function_stack = []
+    self.lines = None
+    self.exit_indent = None   # Indent of the block the last written return, raise, break or continue leaves
+
+    self.begin_function('_program', node, None)
+    value = self.visit(node)
+    self.write(f'return {value}', node)
+    self.end_function()
+
+    # Assemble the constants first, then every function, while numbering generated lines
+    source_lines = []
+    line_map = {}
+    for line, pos in self.const_lines + [line for function in self.functions for line in function]:
+      source_lines.append(line)
+      line_map[len(source_lines)] = pos
+
+    return PythonProgram(fn, text, '\n'.join(source_lines) + '\n', self.positions, line_map, names)
+
+  # Translate a specific node based on its type and return the Python expression holding its value
+  def visit(self, node):
+    method_name = f'transpile_{type(node).__name__}'
+    method = getattr(self, method_name, self.no_transpile_method)
+    return method(node)
+
+  # Error handling for undefined transpile methods
+  def no_transpile_method(self, node):
+    raise Exception(f'No transpile_{type(node).__name__} method defined')
+
+  ###################################
+
+  # Start a new Python function for the program (without a scope) or a ROTA body, saving the one being written
+  def begin_function(self, name, node, scope):
+    if self.lines is not None:
+      self.function_stack.append((self.lines, self.indent, self.temp_count, self.loop_depth, self.scope, self.exit_indent))
+    self.lines, self.indent, self.temp_count, self.loop_depth, self.scope, self.exit_indent = [], 1, 0, 0, scope, None
+    self.lines.append((f'def {name}(context):', node.pos_start))
+    self.write('_v = context.symbol_table.values' if scope else '_s = context.symbol_table.symbols', node)
+
+  # Finish the current Python function and resume the enclosing one
+  def end_function(self):
+    self.functions.append(self.lines)
+    self.lines = None
+    if self.function_stack:
+      self.lines, self.indent, self.temp_count, self.loop_depth, self.scope, self.exit_indent = self.function_stack.pop()
+
+  # Append a line of Python to the current function
+  # Lines after a return, raise, break or continue in the same block are never reached and are left out
+  def write(self, line, node):
+    if self.exit_indent is not None:
+      if self.indent >= self.exit_indent: return
+      self.exit_indent = None
+    self.lines.append(('  ' * self.indent + line, node.pos_start))
+
+  # Append a line of Python leaving the current block, so the rest of the block is not written
+  def write_exit(self, line, node):
+    self.write(line, node)
+    if self.exit_indent is None: self.exit_indent = self.indent
+
+  # Return a fresh local variable name
+  def temp(self, prefix='t'):
+    self.temp_count += 1
+    return f'{prefix}{self.temp_count}'
+
+  # Register a source span and return the Python expression that reads it
+  def span(self, pos_start, pos_end):
+    self.positions.append((pos_start, pos_end))
+    return f'_P[{len(self.positions) - 1}]'
+
+  # Add a module-level constant and return its name
+  def const(self, expr, node):
+    name = f'_k{len(self.const_lines)}'
+    self.const_lines.append((f'{name} = {expr}', node.pos_start))
+    return name
+
+  # Python expression for the raw value of a Number
+  def number_value(self, value):
+    if value in self.number_consts: return repr(self.number_consts[value])
+    return f'{value}.value'
+
+  # Python condition testing the truthiness of a value
+  def truthy(self, value):
+    return f'({value}.value != 0 if {value}.__class__ is _Number else {value}.is_true())'
+
+  ###################################
+
+  def transpile_NumberNode(self, node):
+    name = self.const(f'_Number({node.tok.value!r})', node)
+    self.number_consts[name] = node.tok.value
+    return name
+
+  def transpile_StringNode(self, node):
+    return self.const(f'_String({node.tok.value!r})', node)
+
+  def transpile_ListNode(self, node):
+    elements = [self.visit(element_node) for element_node in node.element_nodes]
+    result = self.temp()
+    self.write(f'{result} = _List([{", ".join(elements)}], context, {self.span(node.pos_start, node.pos_end)})', node)
+    return result
+
+  def transpile_MapNode(self, node):
+    keys = []
+    values = []
+    for key_node, value_node in zip(node.key_nodes, node.value_nodes):
+      keys.append(self.visit(key_node))
+      values.append(self.visit(value_node))
+    key_spans = ''.join(f'{self.span(key_node.pos_start, key_node.pos_end)}, ' for key_node in node.key_nodes)
+    result = self.temp()
+    self.write(f'{result} = _Map([{", ".join(keys)}], [{", ".join(values)}], ({key_spans}), context, {self.span(node.pos_start, node.pos_end)})', node)
+    return result
+
+  def transpile_SetNode(self, node):
+    elements = [self.visit(element_node) for element_node in node.element_nodes]
+    element_spans = ''.join(f'{self.span(element_node.pos_start, element_node.pos_end)}, ' for element_node in node.element_nodes)
+    result = self.temp()
+    self.write(f'{result} = _Set([{", ".join(elements)}], ({element_spans}), context, {self.span(node.pos_start, node.pos_end)})', node)
+    return result
+
+  def transpile_VarAccessNode(self, node):
+    var_name = node.var_name_tok.value
+    span = self.span(node.pos_start, node.pos_end)
+    result = self.temp()
+
+    # Unassigned locals are None and fall back to a lookup in the calling frames
+    if node.slot is not None:
+      self.write(f'{result} = _v[{node.slot}] or _load(context, {var_name!r}, {span})', node)
+    elif self.scope:
+      self.write(f'{result} = _global(context, {var_name!r}, {span})', node)
     else:
-      value = Number.null
+      self.write(f'{result} = _s.get({var_name!r}) or _load(context, {var_name!r}, {span})', node)
+    return result
 
-    return res.success_return(value)
+  def transpile_VarAssignNode(self, node):
+    value = self.visit(node.value_node)
+    self.write(f'{self.target(node.var_name_tok.value, node.slot)} = {value}', node)
+    return value
 
-  # Visit a Continue Node and return a success result with a continue flag
-  def visit_ContinueNode(self, node, context):
-    return RTResult().success_continue()
+  # Python target storing a variable in its frame slot or symbol table entry
+  def target(self, var_name, slot):
+    if slot is not None: return f'_v[{slot}]'
+    return f'_s[{var_name!r}]'
+
+  def transpile_BinOpNode(self, node):
+    left = self.visit(node.left_node)
+    right = self.visit(node.right_node)
+    opcode, method_name = BINARY_OPCODES[node.op_key]
+
+    # Number constants are known at transpile time, so their value is inlined and their type check dropped
+    checks = [f'{value}.__class__ is _Number' for value in (left, right) if value not in self.number_consts]
+    if opcode == OP_DIV and right not in self.number_consts:
+      checks.append(f'{right}.value != 0')
+    fast = PYTHON_NUMBER_OPS[opcode].format(self.number_value(left), self.number_value(right))
+    left_span = self.span(node.left_node.pos_start, node.left_node.pos_end)
+    right_span = self.span(node.right_node.pos_start, node.right_node.pos_end)
+    slow = f'_binop({method_name!r}, {left}, {right}, {left_span}, {right_span}, context)'
+
+    result = self.temp()
+    if opcode == OP_DIV and self.number_consts.get(right) == 0:
+      self.write(f'{result} = {slow}', node)
+    elif checks:
+      self.write(f'{result} = {fast} if {" and ".join(checks)} else {slow}', node)
+    else:
+      self.write(f'{result} = {fast}', node)
+    return result
 
-  # Visit a BreakNode and return a success result with a break flag
-  def visit_BreakNode(self, node, context):
-    return RTResult().success_break()
+  def transpile_UnaryOpNode(self, node):
+    value = self.visit(node.node)
+    span = self.span(node.node.pos_start, node.node.pos_end)
+
+    if node.op_tok.type == TT_KWAI:
+      fast, method_name = f'_Number(-{value}.value)', 'multed_by'
+    elif node.op_tok.matches(TT_KEYWORD, 'DILI'):
+      fast, method_name = f'(_true if {value}.value == 0 else _false)', 'notted'
+    else:
+      return value
+
+    result = self.temp()
+    self.write(f'{result} = {fast} if {value}.__class__ is _Number else _unary({method_name!r}, {value}, {span}, context)', node)
+    return result
+
+  def transpile_IfNode(self, node):
+    result = self.temp()
+    indent = self.indent
+
+    # Every further case is tested inside the else branch of the previous one
+    for condition, expr, should_return_null in node.cases:
+      condition_value = self.visit(condition)
+      self.write(f'if {self.truthy(condition_value)}:', condition)
+      self.indent += 1
+      self.transpile_branch(result, expr, should_return_null)
+      self.indent -= 1
+      self.write('else:', condition)
+      self.indent += 1
+
+    if node.else_case:
+      expr, should_return_null = node.else_case
+      self.transpile_branch(result, expr, should_return_null)
+    else:
+      self.write(f'{result} = _null', node)
+
+    self.indent = indent
+    return result
+
+  # Translate the body of an if case into an assignment of its value
+  def transpile_branch(self, result, expr, should_return_null):
+    value = self.visit(expr)
+    self.write(f'{result} = {"_null" if should_return_null else value}', expr)
+
+  def transpile_ForNode(self, node):
+    start = self.visit(node.start_value_node)
+    end = self.visit(node.end_value_node)
+    step = self.visit(node.step_value_node) if node.step_value_node else None
+    elements = self.start_results(node)
+
+    counter = self.temp('i')
+    bounds = [self.number_value(start), self.number_value(end), self.number_value(step) if step else '1']
+    self.write(f'for {counter} in _range({", ".join(bounds)}):', node)
+    self.indent += 1
+    self.write(f'{self.target(node.var_name_tok.value, node.slot)} = _Number({counter})', node)
+    self.transpile_loop_body(node, elements)
+    self.indent -= 1
+    return self.finish_results(node, elements)
+
+  def transpile_WhileNode(self, node):
+    elements = self.start_results(node)
+
+    self.write('while True:', node)
+    self.indent += 1
+    condition = self.visit(node.condition_node)
+    self.write(f'if not {self.truthy(condition)}: break', node)
+    self.transpile_loop_body(node, elements)
+    self.indent -= 1
+    return self.finish_results(node, elements)
+
+  # Create the Python list collecting loop body values, unless the loop returns null
+  def start_results(self, node):
+    if node.should_return_null: return None
+    elements = self.temp('r')
+    self.write(f'{elements} = []', node)
+    return elements
+
+  # Translate a loop body; loop signals escaping called functions are caught only when the body calls something
+  def transpile_loop_body(self, node, elements):
+    catch_signals = contains_call(node.body_node)
+    if catch_signals:
+      self.write('try:', node)
+      self.indent += 1
+
+    self.loop_depth += 1
+    value = self.visit(node.body_node)
+    self.loop_depth -= 1
+
+    if catch_signals:
+      self.indent -= 1
+      self.write('except _ContinueSignal: continue', node)
+      self.write('except _BreakSignal: break', node)
+
+    if elements:
+      self.write(f'{elements}.append({value})', node)
+
+  # Return the loop value, a List of the collected body values or null
+  def finish_results(self, node, elements):
+    if not elements: return '_null'
+    result = self.temp()
+    self.write(f'{result} = _List({elements}, context, {self.span(node.pos_start, node.pos_end)})', node)
+    return result
+
+  def transpile_FuncDefNode(self, node):
+    func_name = node.var_name_tok.value if node.var_name_tok else None
+    arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+    function = f'_f{self.function_count}'
+    self.function_count += 1
+
+    # The body becomes its own top-level Python function taking the call context
+    self.begin_function(function, node, node.scope)
+    value = self.visit(node.body_node)
+    self.write(f'return {value if node.should_auto_return else "_null"}', node)
+    self.end_function()
+
+    scope = self.const(f'_Scope({node.scope.names!r})', node) if node.scope else 'None'
+    result = self.temp()
+    self.write(f'{result} = _function({func_name!r}, {function}, {arg_names!r}, {scope}, context, {self.span(node.pos_start, node.pos_end)})', node)
+    if func_name:
+      self.write(f'{self.target(func_name, node.slot)} = {result}', node)
+    return result
+
+  def transpile_CallNode(self, node):
+    value_to_call = self.visit(node.node_to_call)
+    args = [self.visit(arg_node) for arg_node in node.arg_nodes]
+    result = self.temp()
+    call = '_tail_call' if node.tail else '_call'
+    self.write(f'{result} = {call}({value_to_call}, [{", ".join(args)}], {self.span(node.pos_start, node.pos_end)}, context)', node)
+    return result
+
+  def transpile_MemberAccessNode(self, node):
+    value = self.visit(node.node)
+    result = self.temp()
+    self.write(f'{result} = _member({value}, {node.member_name_tok.value!r}, {self.span(node.pos_start, node.pos_end)}, context)', node)
+    return result
+
+  def transpile_ReturnNode(self, node):
+    value = self.visit(node.node_to_return) if node.node_to_return else '_null'
+    if self.function_stack:
+      self.write_exit(f'return {value}', node)
+    else:
+      self.write_exit(f'raise _ReturnSignal({value})', node)
+    return '_null'
+
+  def transpile_ContinueNode(self, node):
+    self.write_exit('continue' if self.loop_depth else 'raise _ContinueSignal()', node)
+    return '_null'
+
+  def transpile_BreakNode(self, node):
+    self.write_exit('break' if self.loop_depth else 'raise _BreakSignal()', node)
+    return '_null'
+
+# Transpiled programs by (fn, text), so running the same source again skips lexing, parsing and compiling
+python_program_cache = {}
+PYTHON_PROGRAM_CACHE_SIZE = 64
+
+# Lex, parse and transpile a program, returning a cached PythonProgram when the source was seen before
+# The constants the program may inline are part of what it is translated to, so they are part of the cache key
+def transpile(fn, text, keep_result=True, constants=None):
+  if constants is None: constants = inlinable_constants(fn)
+  key = (fn, text, keep_result, FULL_TRACEBACKS, tuple(constants))
+  program = python_program_cache.get(key)
+  if program: return program, None
+
+  node, error = cached_parse(fn, text)
+  if error: return None, error
+
+  names = Resolver().resolve(node)
+  uses_modules = loads_modules(node, text)
+  node = Optimizer().optimize(node, keep_result, {} if uses_modules else constants)
+  if uses_modules: prefetch_modules(node)
+  program = PythonTranspiler().transpile(fn, text, node, names)
+  if len(python_program_cache) >= PYTHON_PROGRAM_CACHE_SIZE:
+    del python_program_cache[next(iter(python_program_cache))]
+  python_program_cache[key] = program
+  return program, None
+
+#------------------------------#
+# MODULES
+#------------------------------#
+
+# Modules loaded by LARGA by resolved path, each with the modification time of the file it was loaded from
+module_cache = {}
+
+# Files being parsed ahead of LARGA by resolved path, each with its name, modification time, text and the future of its parse
+module_prefetches = {}
+
+# Pool of worker processes parsing the prefetched files, started when a file first needs parsing
+prefetch_pool = None
+
+# Worker processes are forked, one per CPU besides the one running the program; with none prefetching is off
+PREFETCH_WORKERS = (os.cpu_count() or 1) - 1 if 'fork' in multiprocessing.get_all_start_methods() else 0
+
+# LARGA calls with a literal file name in the text of a prefetched file, found before it is parsed
+LARGA_CALL_REGEX = re.compile(r'\bLARGA[ \t]*\([ \t]*"([^"\\\n]*)"[ \t]*\)')
+
+# Whether a program reads the name LARGA anywhere and so may load modules; a text without the name cannot
+def loads_modules(node, text):
+  if 'LARGA' not in text: return False
+  nodes = [node]
+  while nodes:
+    node = nodes.pop()
+    if isinstance(node, VarAccessNode) and node.var_name_tok.value == 'LARGA': return True
+    nodes.extend(iter_child_nodes(node))
+  return False
+
+# File names of the LARGA calls with a string literal argument in a program, in the order they appear
+def find_larga_targets(node):
+  targets = []
+  nodes = [node]
+  while nodes:
+    node = nodes.pop()
+    if (
+      isinstance(node, CallNode) and isinstance(node.node_to_call, VarAccessNode)
+      and node.node_to_call.var_name_tok.value == 'LARGA'
+      and len(node.arg_nodes) == 1 and isinstance(node.arg_nodes[0], StringNode)
+    ):
+      targets.append(node.arg_nodes[0].tok.value)
+    nodes.extend(reversed(list(iter_child_nodes(node))))
+  return targets
+
+# Parse a prefetched file in a worker process, returning its pickled tree, read from or written to its on-disk cache entry
+# None stands for a tree that failed to parse or to pickle, LARGA parses it again itself to report the error
+def prefetch_parse(fn, text):
+  text_hash = source_hash(fn, text)
+  path = parse_cache_path(fn)
+  data = read_parse_cache(path, text_hash) if path else None
+  if data is not None: return data
+
+  node, error = without_gc(parse_source, fn, text)
+  if error: return None
+  data = dump_tree(node)
+  if data is not None and path: write_parse_cache(path, text_hash, data)
+  return data
+
+# The pool parsing prefetched files, started with every worker on first use so later prefetches in the process get them all
+def prefetch_executor():
+  global prefetch_pool
+  if prefetch_pool is None:
+    prefetch_pool = concurrent.futures.ProcessPoolExecutor(PREFETCH_WORKERS, mp_context=multiprocessing.get_context('fork'))
+  return prefetch_pool
+
+# Start parsing the files a program will load and, through their text, the files those will load, while the program runs
+# Each file is handed to a worker as soon as it is read, so it parses while the files after it are read and scanned
+# A file whose on-disk cache entry is current is only read into the parse cache, and no worker is started for it
+# A file that cannot be read is left for LARGA to report when the program gets there
+def prefetch_modules(node):
+  if not PREFETCH_WORKERS: return
+  pending = find_larga_targets(node)
+  seen = set()
+
+  while pending:
+    fn = pending.pop(0)
+    path = os.path.realpath(fn)
+    if path in seen or path in module_prefetches or path in module_cache: continue
+    seen.add(path)
+
+    try:
+      mtime = os.stat(fn).st_mtime_ns
+      with open(fn, 'r') as f:
+        text = f.read()
+    except (OSError, UnicodeError):
+      continue
+
+    cache_path = parse_cache_path(fn)
+    data = read_parse_cache(cache_path, source_hash(fn, text)) if cache_path else None
+    if data is None:
+      module_prefetches[path] = (fn, mtime, text, prefetch_executor().submit(prefetch_parse, fn, text))
+    else:
+      store_parse_cache((fn, text), data)
+    pending.extend(LARGA_CALL_REGEX.findall(text))
+
+# Text of a file parsed ahead of LARGA with its tree put in the parse cache, None when it was not or has changed since
+def take_prefetched_module(fn, path, mtime):
+  prefetch = module_prefetches.pop(path, None)
+  if prefetch is None: return None
+
+  prefetch_fn, prefetch_mtime, text, future = prefetch
+  if prefetch_fn != fn or prefetch_mtime != mtime: return None
+
+  try:
+    data = future.result()
+  except Exception:
+    return text
+  if data is not None: store_parse_cache((fn, text), data)
+  return text
+
+# Load the program in a file as a module, returning the cached module when the file has not changed since it was loaded
+# The module is cached before its program runs, so a module loading itself, directly or not, gets it back instead of looping
+# The module runs on the given engine, the one of the program loading it when it is first loaded
+# Raises OSError when the file cannot be read
+def load_module(fn, engine='interpreter'):
+  path = os.path.realpath(fn)
+  mtime = os.stat(fn).st_mtime_ns
+  cached = module_cache.get(path)
+  if cached and cached[0] == mtime: return cached[1], None
+
+  text = take_prefetched_module(fn, path, mtime)
+  if text is None:
+    with open(fn, 'r') as f:
+      text = f.read()
+
+  # The module's names live in its own namespace, the builtins are found in the global symbol table above it
+  symbol_table = SymbolTable(global_symbol_table)
+  symbol_table.namespace = symbol_table
+  module = Module(fn, symbol_table)
+  module_cache[path] = (mtime, module)
+
+  _, error = run(fn, text, engine, keep_result=False, symbol_table=symbol_table)
+  if error:
+    module_cache.pop(path, None)
+    return None, error
+  return module, None
 
 #------------------------------#
 # RUN
@@ -2521,24 +5803,87 @@ global_symbol_table.set("PUNO", BuiltInFunction.append)
 global_symbol_table.set("BUTO", BuiltInFunction.pop)
 global_symbol_table.set("ISWAG", BuiltInFunction.extend)
 global_symbol_table.set("SUKOD", BuiltInFunction.len)
+global_symbol_table.set("MGA_YAWE", BuiltInFunction.keys)
+global_symbol_table.set("MGA_BILI", BuiltInFunction.values)
+global_symbol_table.set("NAA_BA", BuiltInFunction.contains)
+global_symbol_table.set("PUNDOK", BuiltInFunction.to_set)
+global_symbol_table.set("MAPA", BuiltInFunction.map)
+global_symbol_table.set("SALA", BuiltInFunction.filter)
+global_symbol_table.set("TIPON", BuiltInFunction.reduce)
+global_symbol_table.set("HANAY", BuiltInFunction.sort)
+global_symbol_table.set("SAKUP", BuiltInFunction.range)
 global_symbol_table.set("LARGA", BuiltInFunction.run)
 
-def run(fn, text):
-  # Lexical analysis: Convert source code text into tokens
-  lexer = Lexer(fn, text)
-  tokens, error = lexer.make_tokens()
+# Box the raw numbers the interpreter stored in the global symbol table
+def box_globals():
+  symbols = global_symbol_table.symbols
+  for name, value in symbols.items():
+    if type(value) in RAW_NUMBER_TYPES:
+      symbols[name] = Number(value)
+
+# Run a program with the chosen engine, keep_result=False lets it skip building values nobody reads
+# The program runs in the global symbol table unless given the namespace of a module
+# A program nested deeper than Python's stack allows, in its source or its calls, fails with an error at its start
+def run(fn, text, engine='interpreter', keep_result=True, symbol_table=None):
+  try:
+    return run_engine(fn, text, engine, keep_result, symbol_table)
+  except RecursionError:
+    pos = Position(0, Source(fn, text))
+    return None, RTError(pos, pos.advance(), 'Maximum recursion depth exceeded', Context('<program>'))
+
+# Parse, resolve and optimize a program, then run it with the chosen engine
+def run_engine(fn, text, engine, keep_result, symbol_table):
+  context = Context('<program>')
+  context.symbol_table = symbol_table or global_symbol_table
+  context.engine = engine
+
+  # Transpiled programs are cached by source and skip lexing and parsing when seen again
+  if engine == 'python':
+    program, error = transpile(fn, text, keep_result, inlinable_constants(fn, symbol_table))
+    if error: return None, error
+    box_globals()
+    result = run_program(program.run, context)
+    return result.value, result.error
+
+  # Lexical and syntax analysis: Parse the tokens into an abstract syntax tree (AST) as the source code text is converted into them
+  # A source parsed before, in this process or an earlier one, reuses its cached tree
+  node, error = cached_parse(fn, text)
   if error: return None, error
 
-  # Syntax analysis: Parse the tokens into an abstract syntax tree (AST)
-  parser = Parser(tokens)
-  ast = parser.parse()
-  if ast.error: return None, ast.error
+  # Resolve the local names of every function to frame slots, then fold constants
+  uses_modules = loads_modules(node, text)
+  constants = {} if uses_modules else inlinable_constants(fn, symbol_table)
+  context.symbol_table.names.update(Resolver().resolve(node))
+  node = Optimizer().optimize(node, keep_result, constants)
+
+  # The files the program loads with LARGA, named by string literals, start parsing in the background before it runs
+  if uses_modules: prefetch_modules(node)
 
-  # Semantic analysis and execution: Interpret the AST
+  # Semantic analysis and execution: Interpret the AST, or compile it to bytecode or closures first
   # To run program
-  interpreter = Interpreter()
+  if engine == 'interpreter':
+    result = run_program(Interpreter().run, node, context)
+    return result.value, result.error
+
+  # The other engines work on Number values, so raw numbers the interpreter left in the globals are boxed first
+  box_globals()
+
+  if engine == 'vm':
+    code = Compiler().compile(node)
+    result = VM().run(code, context)
+  elif engine == 'closure':
+    compiler = ClosureCompiler()
+    result = run_program(compiler.run, compiler.compile(node), context)
+  else:
+    raise Exception(f"Unknown engine '{engine}'")
+
+  return result.value, result.error
+
+# Run the _program function of a standalone transpiled module, whose functions bind and read the given names
+def run_callable(program, bound_names=(), free_names=()):
   context = Context('<program>')
   context.symbol_table = global_symbol_table
-  result = interpreter.visit(ast.node, context)
-
+  context.engine = 'python'
+  global_symbol_table.names.update(ResolvedNames(bound_names, free_names))
+  result = run_program(ClosureCompiler().run, program, context)
   return result.value, result.error
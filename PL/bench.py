@@ -0,0 +1,86 @@
+import sys
+import time
+import timeit
+import tracemalloc
+import BisCom
+
+# Parse a single expression into its AST node, without the optimizer folding it away
+def parse(text):
+	tokens, error = BisCom.Lexer('<bench>', text).make_tokens()
+	ast = BisCom.Parser(tokens).parse()
+	return ast.node.element_nodes[0]
+
+context = BisCom.Context('<bench>')
+context.symbol_table = BisCom.SymbolTable(BisCom.global_symbol_table)
+context.symbol_table.set('x', 2)
+context.symbol_table.set('s', BisCom.String('abc'))
+interpreter = BisCom.Interpreter()
+
+# Per-node cost of the interpreter, dispatch included
+cases = [
+	('NumberNode 1', parse('1')),
+	('VarAccessNode x', parse('x')),
+	('BinOpNode x + x', parse('x + x')),
+	('BinOpNode x < x', parse('x < x')),
+	('BinOpNode s + s', parse('s + s')),
+	('CallNode NUMERO_BA(x)', parse('NUMERO_BA(x)')),
+]
+
+count = 200000
+print('Interpreter per-node cost')
+for name, node in cases:
+	seconds = min(timeit.repeat(lambda: interpreter.visit(node, context), number=count, repeat=5))
+	print(f'  {name:24s} {seconds / count * 1e9:8.1f} ns')
+
+# Parse time of large generated programs, lexing included
+programs = [
+	('20000 assignments', ''.join(f'PASA x{i} = x{i - 1} * 2 + 1\n' for i in range(20000))),
+	('5000 long expressions', ''.join(
+		f'PASA v{i} = (a{i} + b * {i}) ^ 2 - (DILI c < d) UG f(x, y + 1) >= -e / 3\n'
+		for i in range(5000)
+	)),
+	('2000 functions', ''.join(
+		f'ROTA f{i}(a, b)\n  KUNG a < b DAYON\n    BALIK a\n  KINI\n    BALIK b\n  LUGAR\nLUGAR\n'
+		for i in range(2000)
+	)),
+	('2000 loops', ''.join(
+		f'PARA i = 0 PADONG {i} DAYON\n  SAMTANG i < 3 DAYON\n    PASA i = i + 1\n  LUGAR\n  HUNONG\nLUGAR\n'
+		for i in range(2000)
+	)),
+]
+
+print('Parse time')
+for name, text in programs:
+	seconds = min(timeit.repeat(lambda: BisCom.parse_source('<bench>', text), number=1, repeat=3))
+	print(f'  {name:24s} {seconds * 1000:8.1f} ms')
+
+# Memory held by the AST of a large synthetic program, its tokens and positions included
+def count_nodes(node):
+	return 1 + sum(count_nodes(child) for child in BisCom.iter_child_nodes(node))
+
+corpus = ''.join(
+	f'ROTA f{i}(a, b)\n  PASA t = [a, b, {i}]\n  PARA k = 0 PADONG SUKOD(t) DAYON\n'
+	f'    KUNG a < b UG k == 1 DAYON BALIK a * -b + "s"\n  LUGAR\n'
+	f'  SAMTANG a > 0 DAYON PASA a = a - 1\n  BALIK f{i}(b, a)\nLUGAR\n'
+	for i in range(3000)
+)
+tracemalloc.start()
+node, error = BisCom.parse_source('<bench>', corpus)
+size = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+nodes = count_nodes(node)
+print('AST memory')
+print(f'  {nodes} nodes {size / 1e6:8.1f} MB {size / nodes:8.0f} bytes per node')
+
+# Run time of each program given on the command line, on every engine
+engines = ['interpreter', 'vm', 'closure', 'python']
+for fn in sys.argv[1:]:
+	with open(fn, 'r') as f:
+		text = f.read()
+
+	print(fn)
+	for engine in engines:
+		start = time.perf_counter()
+		result, error = BisCom.run(fn, text, engine=engine, keep_result=False)
+		elapsed = time.perf_counter() - start
+		print(f'  {engine:12s} {elapsed * 1000:9.1f} ms' + (' (error)' if error else ''))
@@ -0,0 +1,21 @@
+import sys
+import BisCom
+
+# Transpile a BisCom source file into a standalone Python module next to it
+if len(sys.argv) != 2:
+	print('Usage: python compile.py <filename>.bob')
+	sys.exit(1)
+
+fn = sys.argv[1]
+with open(fn, 'r') as f:
+	text = f.read()
+
+program, error = BisCom.transpile(fn, text, keep_result=False)
+if error:
+	print(error.as_string())
+	sys.exit(1)
+
+out_fn = fn.rsplit('.', 1)[0] + '.py'
+with open(out_fn, 'w') as f:
+	f.write(program.module_source())
+print(f'Compiled {fn} to {out_fn}')